@@ -1,11 +1,95 @@
-from typing import Any, List
+import time
+from typing import Any, Dict, Hashable, List
 
 class Action:
     """The Action class represents an action that the bot takes."""
-    def __init__(self, func: "function", *args: List[Any]):
-        """If a function takes no arguments, its args attribute will be None."""
+    __slots__ = ("func", "args", "key", "cooldown")
+
+    def __init__(self, func: "function", *args: List[Any], key: Hashable = None, cooldown: float = 0.0):
+        """If a function takes no arguments, its args attribute will be None.
+        Params:
+            key: Identifies the action. Actions with the same key are duplicates of each other.
+            Default: None (never merged and no cooldown, so submitting the same action twice runs it twice)
+            cooldown: Minimum amount of seconds between two runs of actions with this key. Needs a key. Default: 0"""
         self.func = func
         if args:
             self.args = args
         else:
-            self.args = None
\ No newline at end of file
+            self.args = None
+        self.key = key
+        self.cooldown = cooldown
+
+
+    def __repr__(self) -> str:
+        return f"Action({getattr(self.func, '__name__', self.func)}, {self.args})"
+
+
+    async def run(self) -> None:
+        """Runs the action."""
+        if self.args is None:
+            await self.func()
+        else:
+            await self.func(*self.args)
+
+
+class ActionScheduler:
+    """The ActionScheduler class runs the actions a bot submits, merging duplicate actions and
+    skipping actions whose cooldown hasn't passed yet."""
+    def __init__(self):
+        # action key -> time.time() the action was last run
+        self.last_run: Dict[Hashable, float] = {}
+
+
+    @staticmethod
+    def _key(action: Action) -> Hashable:
+        """Returns the key of action, or None if it has no key or its key can't be hashed (never merged)."""
+        try:
+            hash(action.key)
+        except TypeError:
+            return None
+
+        return action.key
+
+
+    def coalesce(self, actions: List[Action]) -> List[Action]:
+        """Merges actions with the same key, keeping the position of the first one and the latest submission."""
+        merged: Dict[Hashable, Action] = {}
+
+        for action in actions:
+            key = self._key(action)
+            # keyless actions are stored under a key of their own
+            merged[key if key is not None else object()] = action
+
+        return list(merged.values())
+
+
+    def ready(self, action: Action, now: float = None) -> bool:
+        """Returns True if action's cooldown has passed (always True for keyless actions)."""
+        key = self._key(action)
+        if key is None:
+            return True
+
+        last = self.last_run.get(key)
+        if last is None:
+            return True
+
+        return (time.time() if now is None else now) - last >= action.cooldown
+
+
+    async def run(self, actions: List[Action]) -> List[Action]:
+        """Runs the given actions in order, after merging duplicates and dropping the ones that are on cooldown.
+        Returns the actions that were run."""
+        ran = []
+
+        for action in self.coalesce(actions):
+            if self.ready(action):
+                # TODO create tasks for actions that can be done asynchronously to other tasks (i.e. sending units
+                # on minimap and moving minimap, or building units while microing)
+                await action.run()
+
+                key = self._key(action)
+                if key is not None:
+                    self.last_run[key] = time.time()
+                ran.append(action)
+
+        return ran
@@ -2,7 +2,8 @@ import abc
 import asyncio
 from collections import defaultdict
 import time
-from typing import List, Set, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Set, Tuple
 
 import cv2
 from directkeys import PressKey, ReleaseKey
@@ -10,13 +11,18 @@ import numpy as np
 from PIL import ImageGrab
 import pyautogui
 
-from Action import Action
-from constants import AutoPlay, ImageName, Mass, MenuState, THRESHOLDS_NUMS, UnitType, UnitCost
-from helpers import CounterLE, process_img
+from Action import Action, ActionScheduler
+from constants import AutoPlay, ImageName, Mass, MatchResult, MenuState, MINIMAP_ANCHOR, THRESHOLDS_NUMS, UnitType, UnitCost
+from helpers import CounterLE, group_points, process_img
 from InputHandler import InputHandler
 from hexkeys import HexKey
 from Logger import LFlag, Logger
+from History import StateHistory
+from MatchStats import MatchStats
+from Minimap import MinimapReader
+from Perception import GameSnapshot, Perception
 from ScreenHandler import ScreenHandler
+from Visualizer import Visualizer
 
 class BotBase(abc.ABC):
     """The BotBase class is meant to be inherited by the bot classes of bot creators.
@@ -26,12 +32,47 @@ class BotBase(abc.ABC):
     DEFAULT_ITER_RATE = 0.3
     DEFAULT_STATE = MenuState.Main
 
+    # seconds the in-game HUD has to be missing for the game to be considered over
+    GAME_OVER_TIMEOUT = 6.0
+    # longest amount of time (seconds) to wait for the HUD to show up when loading a match
+    LOADING_TIMEOUT = 60
+    # longest amount of time (seconds) the actions of one step can take, and a mass button is searched for
+    # (buttons disappear when the match ends)
+    ACTION_TIMEOUT = 5.0
+    MASS_TIMEOUT = 1.0
+    # longest amount of time (seconds) to wait for a known menu after a match, and seconds between clicks
+    # dismissing the end of match screen meanwhile
+    POSTGAME_TIMEOUT = 60
+    DISMISS_RATE = 2.0
+    # TODO enable once the statue colors and positions in constants.py are calibrated. Until then every
+    # result is recorded as Unknown instead of guessed from uncalibrated reads.
+    STATUE_RESULTS = False
+    MENU_POLL_RATE = 0.1
+
+    # seconds between runs of each perception detector
+    RESOURCE_DETECT_RATE = 0.1
+    UNIT_DETECT_RATE = 0.5
+    MINIMAP_DETECT_RATE = 0.1
+    MENU_DETECT_RATE = 1.0
+
+    # seconds of gold history used to estimate income
+    INCOME_WINDOW = 10.0
+    # how far (gold) a gold change can be from what income predicts to still be considered
+    GOLD_CHANGE_TOLERANCE = 75
+
+    MINER_MASS = (Mass.MinerGarrison, Mass.MinerAdvance)
+    # autoplay options that queue a new match after every match
+    REQUEUE_AUTOPLAY = (AutoPlay.EasyChaos, AutoPlay.Ladder)
+
+    UNIT_IMAGES = ("archer", "enemy_crawler")
+    MENU_IMAGES = ("custom", "play_match", "play_match_ladder", "order")
+
     STARTING_GOLD = 500
     STARTING_MANA = 0
 
     def __init__(self, topleft_coord: Tuple[int, int], botright_coord: Tuple[int, int], iter_rate: int = DEFAULT_ITER_RATE,
     state: MenuState = DEFAULT_STATE, autoplay_flg: AutoPlay = None, debug: bool = False,
-    debug_flags: LFlag or Set[LFlag] = None):
+    debug_flags: LFlag or Set[LFlag] = None, log_path: str = None):
         """
         Params:
             topleft_coord: Top left coordinate of the stickempires game window (not entire browser).
@@ -41,6 +82,7 @@ class BotBase(abc.ABC):
             autoplay: Whether or not to have the bot automatically do something. Default: None (no)
             debug: Whether or not to have debug messages on. Default: False
             debug_flags: Flags to examine for debug. Default: None (all flags)
+            log_path: File to write structured debug records to, instead of printing them. Default: None (print)
             
         Notes:
             If iter_rate is too low, actions might start getting missed.
@@ -55,15 +97,50 @@ class BotBase(abc.ABC):
         self.debug = debug
 
         self.input: InputHandler = InputHandler()
-        self.logger: Logger = Logger(debug, debug_flags)
+        self.actions: ActionScheduler = ActionScheduler()
+        self.logger: Logger = Logger(debug, debug_flags, log_path)
         self.screen: ScreenHandler = ScreenHandler(self.topleft, self.botright)
+        self.minimap: MinimapReader = MinimapReader()
+        self.perception: Perception = Perception(self.screen, self.logger,
+        snapshot = GameSnapshot(timestamp = time.time(), gold = self.STARTING_GOLD, mana = self.STARTING_MANA))
+        self.visualizer: Visualizer = Visualizer()
+
+        in_game = lambda: self.state == MenuState.Playing
+        # the HUD is also looked for while loading, to notice when the match starts
+        hud_expected = lambda: self.state in (MenuState.Loading, MenuState.Playing)
+        in_menu = lambda: self.state not in (MenuState.Loading, MenuState.Playing)
+        self.perception.add_detector("resources", self.read_res, self.RESOURCE_DETECT_RATE, hud_expected,
+        self._apply_resources, self._prepare_resources)
+        self.perception.add_detector("units", self._detect_units, self.UNIT_DETECT_RATE, in_game, self._apply_units)
+        self.perception.add_detector("minimap", self._detect_minimap, self.MINIMAP_DETECT_RATE, in_game,
+        self._apply_minimap)
+        self.perception.add_detector("menu", self._detect_menu, self.MENU_DETECT_RATE, in_menu, self._apply_menu)
 
         ### state attributes. May want to specify these during testing.
 
         self.gold: int = self.STARTING_GOLD
         self.mana: int = self.STARTING_MANA
+        # total gold spent by build(), and (gold, spent) when the frame gold is being read from was captured
+        self._spent: int = 0
+        self._read_base: Tuple[int, int] = (self.gold, self._spent)
         self.on_left: bool = True
+        # "army"/"miner" -> (Mass, on_left) of the last mass order given to that group
+        self.mass_in_effect: Dict[str, Tuple[Mass, bool]] = {}
         self.state: MenuState = state
+
+        ### match runner attributes
+
+        self.stats: MatchStats = MatchStats()
+        self.history: StateHistory = StateHistory()
+        # time.time() the HUD was last seen, and the menu buttons last seen with the time they were seen
+        self._hud_seen: float = time.time()
+        self.menu: Tuple[str, ...] = ()
+        self._menu_seen: float = 0.0
+        # recent income, set from history on the event loop so the perception thread can read it
+        self._income: float = 0.0
+        self._last_gold_increase: float = None
+        # (left, right) statues standing, as last read while the minimap was visible
+        self._statues: Tuple[bool, bool] = (True, True)
         
     ### functions related to the inner workings of the bot
 
@@ -72,13 +149,20 @@ class BotBase(abc.ABC):
         """Main function of the bot. Manages timing of on_step, screen recording, logging, etc."""
         # setup
         if self.debug:
-            screen_task = asyncio.create_task(self.screen.show())
+            # the visualizer reuses the perception pipeline's frames instead of capturing its own
+            self.perception.subscribe(self.visualizer.publish)
+            self.visualizer.start()
+        perception_task = asyncio.create_task(self.perception.run())
         
-        await self.main_loop()
-
-        # cleanup
-        if self.debug:
-            await screen_task
+        try:
+            await self.main_loop()
+        finally:
+            # cleanup
+            self.perception.stop()
+            await perception_task
+            if self.debug:
+                self.visualizer.stop()
+            self.logger.close()
 
 
     async def main_loop(self):
@@ -86,17 +170,22 @@ class BotBase(abc.ABC):
         if self.autoplay == AutoPlay.Manual:
             return
 
+        loops = {
+            MenuState.Main: self.main_menu_loop,
+            MenuState.Custom: self.custom_menu_loop,
+            MenuState.Race: self.race_menu_loop,
+            MenuState.Loading: self.loading_loop,
+            MenuState.Playing: self.playing_loop,
+            MenuState.PostGame: self.postgame_loop
+        }
+
         while True:
-            if self.state == MenuState.Main:
-                await self.main_menu_loop()
-            if self.state == MenuState.Custom:
-                await self.custom_menu_loop()
-            if self.state == MenuState.Race:
-                await self.race_menu_loop()
-            if self.state == MenuState.Loading:
-                await self.loading_loop()
-            if self.state == MenuState.Playing:
-                await self.playing_loop()
+            state = self.state
+            start = time.time()
+
+            await loops[state]()
+
+            self.stats.add_state_time(state, time.time() - start)
 
 
     async def main_menu_loop(self):
@@ -104,42 +193,91 @@ class BotBase(abc.ABC):
         assert self.state == MenuState.Main, f"State is currently {self.state}, should be 'main' to run bot's main menu loop."
 
         if self.autoplay == AutoPlay.EasyChaos:
-            await self.input.wait_click(self.screen, ImageName["custom"])
+            if not await self.menu_click("custom"):
+                return
 
             self.state = MenuState.Custom
 
+        if self.autoplay == AutoPlay.Ladder:
+            if not await self.menu_click("play_match_ladder", threshold = 0.7):
+                return
+
+            # race selection shows up once an opponent is found
+            self.state = MenuState.Race
+
+        if self.autoplay not in self.REQUEUE_AUTOPLAY:
+            # the menus are left to the player
+            await asyncio.sleep(self.MENU_POLL_RATE)
+
 
     async def custom_menu_loop(self):
         """Bot run loop for custom match menu."""
         assert self.state == MenuState.Custom, f"State is currently {self.state}, should be 'custom' to run bot's custom menu loop."
 
         if self.autoplay == AutoPlay.EasyChaos:
-            await self.input.wait_click(self.screen, ImageName["choose_map"], y_delta = 25)
-            await self.input.wait_click(self.screen, ImageName["gates"])
+            # the menu is gone through again from the start if a click doesn't land
+            if not await self.menu_click("choose_map", y_delta = 25) or not await self.menu_click("gates"):
+                return
             # if a friend is online, easy chaos won't be default selection
             if not await self.screen.screen_find(ImageName["easy_chaos"]):
-                await self.input.wait_click(self.screen, ImageName["choose_friend"], y_delta = 25)
-                await self.input.wait_click(self.screen, ImageName["easy_chaos"])
+                if not await self.menu_click("choose_friend", y_delta = 25) or not await self.menu_click("easy_chaos"):
+                    return
 
-            await self.input.wait_click(self.screen, ImageName["play_match"], threshold = 0.7)
+            if not await self.menu_click("play_match", threshold = 0.7):
+                return
 
             self.state = MenuState.Race
+        else:
+            await asyncio.sleep(self.MENU_POLL_RATE)
 
 
     async def race_menu_loop(self):
         """Bot run loop for race selection menu."""
         assert self.state == MenuState.Race, f"State is currently {self.state}, should be 'race_selection' to run bot's race selection loop."
         # TODO wait until loading screen starts to switch?
-        await self.input.wait_click(self.screen, ImageName["order"])
+        if not await self.menu_click("order"):
+            return
 
         self.state = MenuState.Loading
 
 
+    async def menu_click(self, name: str, **kwargs) -> bool:
+        """Clicks the menu button name (ImageName key) and waits until the click is acknowledged.
+        Keyword arguments are passed on to InputHandler.wait_click(). Returns False (and logs) if it never was."""
+        if await self.input.wait_click(self.screen, ImageName[name], ack = True, **kwargs):
+            return True
+
+        self.logger.print(f"BotBase.menu_click: clicks on {name} were not acknowledged.")
+        return False
+
+
     async def loading_loop(self):
-        """Bot's loading (players, map screen) loop."""
+        """Bot's loading (players, map screen) loop. Loading is over once the in-game HUD shows up.
+        If the bot queued the match itself, it assumes the match started after LOADING_TIMEOUT seconds."""
         assert self.state == MenuState.Loading, f"State is currently {self.state}, should be 'loading' to run bot's loading loop."
-        # TODO fix with appropriate logic to notice when loading screen is over, as well as record opponent race.
-        await asyncio.sleep(2)
+        # TODO record opponent race.
+        start = time.time()
+        # the perception pipeline looks for the HUD while loading
+        while self._hud_seen <= start:
+            # without autoplay, the player may take any amount of time to start the next match
+            if self.autoplay in self.REQUEUE_AUTOPLAY and time.time() - start > self.LOADING_TIMEOUT:
+                self.logger.print("BotBase.loading_loop: HUD not found, assuming match started.", LFlag.Screen)
+                break
+
+            await asyncio.sleep(self.MENU_POLL_RATE)
+
+        self.gold = self.STARTING_GOLD
+        self.mana = self.STARTING_MANA
+        self._read_base = (self.gold, self._spent)
+        self._hud_seen = time.time()
+        self._income = 0.0
+        self._last_gold_increase = None
+        self.history.clear()
+        self.mass_in_effect.clear()
+        # located again on the first frame of the match
+        self.minimap.anchor = None
+        self._statues = (True, True)
+        self.stats.start_match()
 
         self.state = MenuState.Playing
 
@@ -147,6 +285,12 @@ class BotBase(abc.ABC):
     async def playing_loop(self):
         """Bot's playing loop, responsible for playing the game."""
         assert self.state == MenuState.Playing, f"State is currently {self.state}, should be 'playing' to run bot's playing loop."
+        # bot may have been started in the middle of a match
+        if not self.stats.in_match():
+            self.stats.start_match()
+
+        tick_start = time.time()
+        self.logger.tick += 1
         try:
             # NOTE not sure if timeout will work, since asyncio wasn't interrupting
             # tasks fast enough before it seemed... (if they don't await)
@@ -154,13 +298,87 @@ class BotBase(abc.ABC):
         except asyncio.TimeoutError:
             actions = []
 
-        for action in actions:
-            # TODO create tasks for actions that can be done asynchronously to other tasks (i.e. sending units
-            # on minimap and moving minimap, or building units while microing)
-            if action.args is None:
-                await action.func()
-            else:
-                await action.func(*action.args)
+        try:
+            ran = await asyncio.wait_for(self.actions.run(actions), self.ACTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.print(f"BotBase.playing_loop: actions took over {self.ACTION_TIMEOUT} seconds, cancelled.")
+            ran = []
+
+        tick = time.time() - tick_start
+        self.history.record("tick", tick)
+        if self.debug:
+            self.visualizer.mark_actions(ran)
+            self.visualizer.record_tick(tick)
+
+        if self.game_over():
+            await self.end_match()
+
+
+    async def postgame_loop(self):
+        """Bot's loop after a match ends. Clicks the end of match screen away until a menu the bot can queue from
+        shows up, then goes to it. Goes to the main menu after POSTGAME_TIMEOUT seconds.
+        Without autoplay, waits for the next match's HUD instead."""
+        assert self.state == MenuState.PostGame, f"State is currently {self.state}, should be 'postgame' to run bot's post game loop."
+        if self.autoplay not in self.REQUEUE_AUTOPLAY:
+            self.state = MenuState.Loading
+            return
+
+        start = time.time()
+        last_dismiss = 0.0
+        # the perception pipeline looks for menu buttons while in menus
+        while time.time() - start < self.POSTGAME_TIMEOUT:
+            if self._menu_seen > start:
+                if "play_match" in self.menu:
+                    self.state = MenuState.Custom
+                    return
+                if "custom" in self.menu or "play_match_ladder" in self.menu:
+                    self.state = MenuState.Main
+                    return
+
+                # menus were looked for since the match ended, and none to queue from is showing yet
+                if time.time() - last_dismiss >= self.DISMISS_RATE:
+                    await self.dismiss()
+                    last_dismiss = time.time()
+
+            await asyncio.sleep(self.MENU_POLL_RATE)
+
+        self.logger.report(f"BotBase.postgame_loop: no menu found after {self.POSTGAME_TIMEOUT} seconds, "
+        "going to the main menu.")
+        self.state = MenuState.Main
+
+
+    async def dismiss(self) -> None:
+        """Clicks the middle of the game window, to close the end of match screen."""
+        x = (self.topleft[0] + self.botright[0]) // 2
+        y = (self.topleft[1] + self.botright[1]) // 2
+        await self.input.click((x, y))
+
+
+    def game_over(self) -> bool:
+        """Returns True once the in-game HUD has been missing for GAME_OVER_TIMEOUT seconds."""
+        return time.time() - self._hud_seen >= self.GAME_OVER_TIMEOUT
+
+
+    async def end_match(self) -> None:
+        """Records the result of the match that just ended, and moves on to the post game state."""
+        result = self.match_result()
+        record = self.stats.end_match(result)
+        # the production metrics are reported even without debug
+        self.logger.report(f"BotBase.end_match: {result.name} after {record.duration:.1f} seconds. "
+        f"{self.stats.summary()}")
+
+        self.state = MenuState.PostGame
+
+
+    def match_result(self) -> MatchResult:
+        """Returns the result of the match from the statues last seen on the minimap:
+        the match is lost if the bot's statue fell, won if the enemy's did, Unknown otherwise
+        (always Unknown until STATUE_RESULTS is enabled)."""
+        left, right = self._statues
+        if not self.STATUE_RESULTS or left == right:
+            return MatchResult.Unknown
+
+        return MatchResult.Victory if (left if self.on_left else right) else MatchResult.Defeat
 
 
     ### public functions (api interface)
@@ -172,10 +390,17 @@ class BotBase(abc.ABC):
     @abc.abstractmethod
     async def on_step(self) -> List[Action]:
         """Meant to be replaced by botmaker, this function is run on every iteration,
-        generating a list of actions to take for the current iteration."""
+        generating a list of actions to take for the current iteration.
+        Resources, units, etc. are kept up to date in the background; read them from self.snapshot."""
         pass
 
 
+    @property
+    def snapshot(self) -> GameSnapshot:
+        """Latest GameSnapshot published by the perception pipeline."""
+        return self.perception.snapshot
+
+
     async def build(self, unit: UnitType) -> None:
         """Sends an order to build the provided unit.
         Does not do anything if the unit cannot be purchased."""
@@ -183,6 +408,7 @@ class BotBase(abc.ABC):
         g, m, s = UnitCost[unit]
         if g <= self.gold:
             self.gold -= g
+            self._spent += g
         else:
             return
 
@@ -194,25 +420,34 @@ class BotBase(abc.ABC):
         ReleaseKey(val)
 
 
-    async def mass(self, option: Mass) -> None:
-        """Sends one of the mass unit orders (garrison, defend, attack)."""
-        # NOTE not sure if wait_click is needed... (its alright if the operation fails maybe)
+    async def mass(self, option: Mass, force: bool = False) -> None:
+        """Sends one of the mass unit orders (garrison, defend, attack).
+        Does not do anything if the order is already in effect (it was the last order given to the
+        army/miners, on the same side), unless force is True.
+        Gives up if the button isn't found within MASS_TIMEOUT seconds (for example because the match ended)."""
+        group = "miner" if option in self.MINER_MASS else "army"
+        if not force and self.mass_in_effect.get(group) == (option, self.on_left):
+            return
+
         if option == Mass.Defend:
-            await self.input.wait_click(self.screen, ImageName["defend_mass"], threshold = 0.85)
-
-        if option == Mass.Attack:
-            await self.input.wait_click(self.screen, ImageName["right_mass" if self.on_left else "left_mass"])
-        if option == Mass.Garrison:
-            await self.input.wait_click(self.screen, ImageName["left_mass" if self.on_left else "right_mass"])
-        if option == Mass.MinerAdvance:
-            await self.input.wait_click(self.screen,
-            ImageName["right_mass_miner" if self.on_left else "left_mass_miner"], threshold = 0.6)
-        if option == Mass.MinerGarrison:
-            await self.input.wait_click(self.screen,
-            ImageName["left_mass_miner" if self.on_left else "right_mass_miner"], threshold = 0.6)
+            name, threshold = "defend_mass", 0.85
+        elif option == Mass.Attack:
+            name, threshold = "right_mass" if self.on_left else "left_mass", 0.9
+        elif option == Mass.Garrison:
+            name, threshold = "left_mass" if self.on_left else "right_mass", 0.9
+        elif option == Mass.MinerAdvance:
+            name, threshold = "right_mass_miner" if self.on_left else "left_mass_miner", 0.6
+        else:
+            name, threshold = "left_mass_miner" if self.on_left else "right_mass_miner", 0.6
+
+        # only an order that was actually given is in effect
+        if await self.input.wait_click(self.screen, ImageName[name], threshold = threshold, timeout = self.MASS_TIMEOUT):
+            self.mass_in_effect[group] = (option, self.on_left)
+        else:
+            self.logger.print(f"BotBase.mass: {name} not found, {option.name} not given.")
         
 
-    async def _find_numbers(self, screen_match: "image") -> List[Tuple[str, int, int]]:
+    def read_numbers(self, screen_match: "image") -> List[Tuple[str, int, int]]:
         """Finds resource (gold, mana) numbers in the given image,
         returning matches and their coordinates."""
         # TODO improve by changing to priority queue, gets rid of a little waste later on in update_res
@@ -221,69 +456,220 @@ class BotBase(abc.ABC):
 
         for threshold, nums in THRESHOLDS_NUMS.items():
             for num in nums:
-                res = await self.screen.screen_find(ImageName[num], all_imgs = True,
+                res = self.screen.find(ImageName[num], all_imgs = True,
                 screen = screen_match, threshold = threshold, blackwhite = 200)
 
                 if res:
                     xs, ys, _, _ = res
-                    numbers += [(num, x, y) for x, y in zip(xs, ys)]
+                    numbers += [(num, int(x), int(y)) for x, y in zip(xs, ys)]
 
-        self.logger.print(f"BotBase._find_numbers: Found {numbers} numbers.", LFlag.Resources)
+        self.logger.log(LFlag.Resources, "BotBase.read_numbers", numbers = numbers)
 
         return numbers
 
 
-    async def update_gold(self, gold_mana_img: "image") -> None:
-        """Updates the gold attribute.
+    async def _find_numbers(self, screen_match: "image") -> List[Tuple[str, int, int]]:
+        """Asynchronous version of read_numbers()."""
+        return self.read_numbers(screen_match)
+
+
+    def read_gold(self, gold_mana_img: "image", gold: int) -> Tuple[int, List[Tuple[str, int, int]]]:
+        """Reads the gold amount, given that the last known amount is gold.
+        Returns the amount (None if it couldn't be read) and the numbers found on gold_mana_img
+        (refer to read_numbers). Does not change any state.
         Parameters:
-            gold_mana_img: Image of the area between the gold mine and mana essence images (gold amount).
-        Relies on state:
-            self.gold"""
-        gold_nums = CounterLE([num for num, _, _ in await self._find_numbers(gold_mana_img)])
+            gold_mana_img: Image of the area between the gold mine and mana essence images (gold amount)."""
+        numbers = self.read_numbers(gold_mana_img)
+        gold_nums = CounterLE([num for num, _, _ in numbers])
 
         # return prematurely if no numbers detected for gold
         if len(gold_nums) == 0:
-            self.logger.print("BotBase.update_res: could not detect gold.", LFlag.Resources)
-            return
+            self.logger.log(LFlag.Resources, "BotBase.read_gold", gold = None)
+            return None, numbers
 
         # enumerate possible gold amounts
         # TODO +20 for center
         # maybe can check whether or not I have center
         realistic_gold_changes = [75, 150, 225, 300]
         # realistic_gold_changes = [20, 75, 95, 150, 170, 225, 245, 300, 320]
-        pos_golds: List[str] = [str(self.gold + x) for x in realistic_gold_changes]
 
-        self.logger.print(f"Gold numbers are: {gold_nums}", LFlag.Resources)
-        self.logger.print(f"Possible gold values considered are: {pos_golds}.", LFlag.Resources)
+        # only consider the changes close to what income predicts since gold last went up
+        # (if gold didn't change, none of the candidates match and gold stays the same)
+        if self._last_gold_increase is not None and self._income > 0:
+            expected_change = self._income * (time.time() - self._last_gold_increase)
+            likely_changes = [change for change in realistic_gold_changes
+            if abs(change - expected_change) <= self.GOLD_CHANGE_TOLERANCE]
 
+            if likely_changes:
+                realistic_gold_changes = sorted(likely_changes, key = lambda change: abs(change - expected_change))
+
+        pos_golds: List[str] = [str(gold + x) for x in realistic_gold_changes]
+
+        read = None
         for pos_gold in pos_golds:
             pos_gold_ctr = CounterLE(pos_gold)
             if pos_gold_ctr <= gold_nums:
-                self.gold = int(pos_gold)
+                read = int(pos_gold)
                 break
 
-        self.logger.print(f"BotBase.update_res: {self.gold} gold detected.", LFlag.Resources)
+        self.logger.log(LFlag.Resources, "BotBase.read_gold", gold = read, numbers = gold_nums,
+        candidates = pos_golds)
 
+        return read, numbers
 
-    async def update_res(self) -> None:
-        """Updates gold and mana attributes."""
-        
-        gold_res = await self.screen.screen_find(ImageName["gold"], threshold = 0.7)
-        mana_res = await self.screen.screen_find(ImageName["mana"], threshold = 0.7)
-        supply_res = await self.screen.screen_find(ImageName["supply"], threshold = 0.7)
+
+    async def update_gold(self, gold_mana_img: "image") -> List[Tuple[str, int, int]]:
+        """Updates the gold attribute.
+        Returns the numbers found on gold_mana_img (refer to read_numbers).
+        Parameters:
+            gold_mana_img: Image of the area between the gold mine and mana essence images (gold amount).
+        Relies on state:
+            self.gold"""
+        gold, numbers = self.read_gold(gold_mana_img, self.gold)
+        if gold is not None:
+            self.gold = gold
+
+        return numbers
+
+
+    def _prepare_resources(self) -> None:
+        """Notes gold and the gold spent so far, right before the frame read_res() reads is captured.
+        Gold is read relative to that amount, and what is spent while it is being read is subtracted afterwards."""
+        self._read_base = (self.gold, self._spent)
+
+
+    def read_res(self, screen: "image") -> Dict[str, Any]:
+        """Reads gold, along with the HUD anchors (gold, mana and supply images) it is read relative to.
+        Gold is read relative to the amount _prepare_resources() noted when the frame was captured.
+        Returns GameSnapshot fields: "anchors", "digits" and "gold" (only if it could be read).
+        Does not change any state, so it can run on the perception thread."""
+        gold_res = self.screen.find(ImageName["gold"], threshold = 0.7, screen = screen)
+        mana_res = self.screen.find(ImageName["mana"], threshold = 0.7, screen = screen)
+        supply_res = self.screen.find(ImageName["supply"], threshold = 0.7, screen = screen)
+        anchors = {name: tuple(int(v) for v in res) for name, res in
+        (("gold", gold_res), ("mana", mana_res), ("supply", supply_res)) if res}
+        fields = {"anchors": MappingProxyType(anchors), "digits": ()}
 
         if gold_res and mana_res and supply_res:
             gold_x, gold_y, _, _ = gold_res
             mana_x, mana_y, _, mana_h = mana_res
             supply_x, _, _, _ = supply_res
         else:
-            self.logger.print(f"Gold: {gold_res}, mana: {mana_res}, supply: {supply_res}.", LFlag.Resources)
-            self.logger.print("BotBase.update_res: Unable to find gold, mana, or supply images.", LFlag.Resources)
-            return
-
+            if self.logger.allowed(LFlag.Resources):
+                self.logger.log(LFlag.Resources, "BotBase.read_res", found = list(anchors))
+            return fields
 
         # image of the space between gold and mana (with a little extra space)
-        gold_mana_img = self.screen.get_screen((gold_x, gold_y * 0.9), (mana_x, gold_y + mana_h))
-        mana_supply_img = self.screen.get_screen((mana_x, mana_y * 0.9), (supply_x, mana_y + mana_h))
+        gold_mana_img = self.screen.crop(screen, (gold_x, gold_y * 0.9), (mana_x, gold_y + mana_h))
+        mana_supply_img = self.screen.crop(screen, (mana_x, mana_y * 0.9), (supply_x, mana_y + mana_h))
+
+        # a false match can put the anchors out of order, leaving nothing between them
+        if gold_mana_img.size == 0:
+            self.logger.log(LFlag.Resources, "BotBase.read_res", anchors = anchors)
+            return fields
+
+        gold, gold_numbers = self.read_gold(gold_mana_img, self._read_base[0])
+        crop_x, crop_y = max(0, int(gold_x)), max(0, int(gold_y * 0.9))
+        fields["digits"] = tuple((num, x + crop_x, y + crop_y, *self.screen.get_template(ImageName[num]).shape[::-1])
+        for num, x, y in gold_numbers)
+        if gold is not None:
+            fields["gold"] = gold
+
+        return fields
+
+
+    async def update_res(self, screen: "image" = None) -> Dict[str, Tuple[int, int, int, int]]:
+        """Updates the gold attribute (mana isn't read yet).
+        Returns the positions of the gold, mana and supply images that were found.
+        Params:
+            screen: screen image to use. Defaults to current bot screen."""
+        self._prepare_resources()
+        if screen is None:
+            screen = self.screen.get_fullscreen()
+
+        fields = self.read_res(screen)
+        self._apply_resources(fields)
+
+        return dict(fields["anchors"])
+
+
+    ### perception detectors (refer to the Perception class). Detectors run on the perception thread,
+    ### the _apply functions run on the event loop.
+
+
+    def _apply_resources(self, fields: Dict[str, Any]) -> None:
+        """Updates gold, history and when the HUD was last seen from read_res() fields."""
+        now = time.time()
+
+        if "gold" in fields["anchors"]:
+            self._hud_seen = now
+
+        if "gold" in fields:
+            base_gold, base_spent = self._read_base
+            if fields["gold"] > base_gold:
+                self._last_gold_increase = now
+            # the frame was captured before anything build() spent since, so it doesn't show that yet
+            self.gold = fields["gold"] - (self._spent - base_spent)
+
+            self.history.record("gold", self.gold, now)
+            self.history.record("mana", self.mana, now)
+            self._income = self.history["gold"].gain_rate(self.INCOME_WINDOW)
+
+        # build() spends gold without waiting for it to be read
+        fields.update(gold = self.gold, mana = self.mana, on_left = self.on_left)
+
+
+    def _detect_units(self, frame: "image") -> Dict[str, Any]:
+        """Finds every unit image in UNIT_IMAGES on the frame."""
+        units = []
+
+        for name in self.UNIT_IMAGES:
+            res = self.screen.find(ImageName[name], threshold = 0.7, all_imgs = True, screen = frame)
+
+            if res:
+                # one unit matches at many adjacent locations
+                units += [(name, x, y) for x, y in group_points(*res)]
+
+        return {"units": tuple(units)}
+
+
+    def _apply_units(self, fields: Dict[str, Any]) -> None:
+        """Records the amount of units found."""
+        self.history.record("units", len(fields["units"]))
+
+
+    def _detect_minimap(self, frame: "image") -> Dict[str, Any]:
+        """Reads unit densities, the camera position and statue state from the minimap.
+        The minimap is located (from MINIMAP_ANCHOR) once per match; nothing is read until it is found."""
+        if self.minimap.anchor is None:
+            res = self.screen.find(ImageName[MINIMAP_ANCHOR], screen = frame)
+            if not res:
+                return {}
+            self.minimap.anchor = (int(res[0]), int(res[1]))
+
+        return {"minimap": self.minimap.read(frame)}
+
+
+    def _apply_minimap(self, fields: Dict[str, Any]) -> None:
+        """Remembers which statues are standing. Reads where neither is standing are ignored: a statue
+        always stands until the match is over, so the minimap isn't visible on them anymore."""
+        state = fields.get("minimap")
+        if state is not None and any(state.statues):
+            self._statues = state.statues
+
+
+    def _detect_menu(self, frame: "image") -> Dict[str, Any]:
+        """Finds which menu buttons in MENU_IMAGES are visible on the frame."""
+        menu = []
+
+        for name in self.MENU_IMAGES:
+            if self.screen.find(ImageName[name], threshold = 0.7, screen = frame):
+                menu.append(name)
+
+        return {"menu": tuple(menu)}
+
 
-        await self.update_gold(gold_mana_img)
\ No newline at end of file
+    def _apply_menu(self, fields: Dict[str, Any]) -> None:
+        """Stores the menu buttons found, for the menu loops."""
+        self.menu = fields["menu"]
+        self._menu_seen = time.time()
\ No newline at end of file
@@ -3,6 +3,6 @@ from BotBase import BotBase
 from constants import UnitType
 
 class EmptyBot(BotBase):
-    """Does nothing except update resources."""
+    """Does nothing. Resources are still kept up to date by the perception pipeline."""
     async def on_step(self):
-        return [Action(self.update_res)]
\ No newline at end of file
+        return []
\ No newline at end of file
@@ -0,0 +1,143 @@
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class Sample:
+    """The Sample class is a single timestamped value of a RingBuffer."""
+    __slots__ = ("time", "value")
+
+    def __init__(self, time: float, value: float):
+        self.time = time
+        self.value = value
+
+
+    def __repr__(self) -> str:
+        return f"Sample({self.time}, {self.value})"
+
+
+class RingBuffer:
+    """The RingBuffer class holds the last size timestamped values of a quantity (gold, mana, etc.)
+    in fixed size numpy arrays, so memory use doesn't grow with match length."""
+    __slots__ = ("size", "times", "values", "_head", "_count")
+
+    DEFAULT_SIZE = 1024
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        """
+        Params:
+            size: Amount of values kept. Once full, the oldest value is overwritten. Default: 1024
+        """
+        self.size = size
+        self.times = np.zeros(size, dtype = np.float64)
+        self.values = np.zeros(size, dtype = np.float64)
+        self._head = 0
+        self._count = 0
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    def append(self, value: float, t: float = None) -> None:
+        """Adds value at time t (defaults to now). O(1)."""
+        self.times[self._head] = time.time() if t is None else t
+        self.values[self._head] = value
+        self._head = (self._head + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+
+    def latest(self) -> Sample:
+        """Returns the newest sample, or None if the buffer is empty."""
+        if self._count == 0:
+            return None
+
+        i = (self._head - 1) % self.size
+        return Sample(float(self.times[i]), float(self.values[i]))
+
+
+    def window(self, seconds: float = None, now: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (times, values) arrays, oldest first, of the samples in the last seconds seconds
+        (all samples if seconds is None)."""
+        start = (self._head - self._count) % self.size
+        order = (start + np.arange(self._count)) % self.size
+        times, values = self.times[order], self.values[order]
+
+        if seconds is not None:
+            now = time.time() if now is None else now
+            keep = times >= now - seconds
+            times, values = times[keep], values[keep]
+
+        return times, values
+
+
+    def rate(self, seconds: float = None, now: float = None) -> float:
+        """Returns the average change per second (least squares slope) over the last seconds seconds.
+        Returns 0 if there are less than 2 samples."""
+        times, values = self.window(seconds, now)
+        if times.size < 2 or times[-1] == times[0]:
+            return 0.0
+
+        dt = times - times.mean()
+        return float((dt * (values - values.mean())).sum() / (dt * dt).sum())
+
+
+    def gain_rate(self, seconds: float = None, now: float = None) -> float:
+        """Returns the increase per second over the last seconds seconds, ignoring decreases
+        (for gold this is income, since spending is left out)."""
+        times, values = self.window(seconds, now)
+        if times.size < 2 or times[-1] == times[0]:
+            return 0.0
+
+        gains = np.diff(values).clip(min = 0).sum()
+        return float(gains / (times[-1] - times[0]))
+
+
+    def min(self, seconds: float = None, now: float = None) -> float:
+        """Returns the smallest value in the last seconds seconds, or None if there are none."""
+        _, values = self.window(seconds, now)
+        return float(values.min()) if values.size else None
+
+
+    def max(self, seconds: float = None, now: float = None) -> float:
+        """Returns the largest value in the last seconds seconds, or None if there are none."""
+        _, values = self.window(seconds, now)
+        return float(values.max()) if values.size else None
+
+
+    def smoothed(self, seconds: float = None, now: float = None) -> float:
+        """Returns the mean value in the last seconds seconds, or None if there are none."""
+        _, values = self.window(seconds, now)
+        return float(values.mean()) if values.size else None
+
+
+class StateHistory:
+    """The StateHistory class keeps a RingBuffer for every tracked quantity of the game state."""
+    TRACKED = ("gold", "mana", "units", "tick")
+
+    def __init__(self, size: int = RingBuffer.DEFAULT_SIZE):
+        """
+        Params:
+            size: Amount of values kept per quantity. Default: 1024
+        """
+        self.size = size
+        self.buffers: Dict[str, RingBuffer] = {name: RingBuffer(size) for name in self.TRACKED}
+
+
+    def __getitem__(self, name: str) -> RingBuffer:
+        return self.buffers[name]
+
+
+    def record(self, name: str, value: float, t: float = None) -> None:
+        """Appends value to the quantity name, creating a buffer for it if it isn't tracked yet."""
+        if name not in self.buffers:
+            self.buffers[name] = RingBuffer(self.size)
+
+        self.buffers[name].append(value, t)
+
+
+    def clear(self) -> None:
+        """Empties every buffer (for example when a new match starts)."""
+        for name in self.buffers:
+            self.buffers[name] = RingBuffer(self.size)
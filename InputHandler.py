@@ -1,6 +1,9 @@
 import asyncio
+import time
 from typing import Tuple
 
+import cv2
+import numpy as np
 import pyautogui
 
 from ScreenHandler import ScreenHandler
@@ -10,45 +13,130 @@ class InputHandler:
     """The InputHandler class handles inputs to Stickempires."""
     DEFAULT_CLICK_DELAY = 0.01
     DEFAULT_RETRY_DELAY = 0.1
-    
+
+    # clicks can be acknowledged by watching a small patch of the screen for a change
+    DEFAULT_ACK_TIMEOUT = 1.0
+    DEFAULT_ACK_RETRIES = 2
+    DEFAULT_ACK_ROUNDS = 5 # times the image is searched for again after its clicks went unacknowledged
+    ACK_POLL_RATE = 0.03
+    ACK_PATCH_SIZE = 16 # half the width/height of the patch around the click
+    ACK_DIFF_THRESHOLD = 8 # mean absolute pixel difference for the patch to count as changed
+
     def __init__(self):
         pass
 
 
-    async def click(self, loc: Tuple[int, int], delay: float = DEFAULT_CLICK_DELAY, left_click: bool = True) -> None:
+    def region_around(self, loc: Tuple[int, int], size: int = ACK_PATCH_SIZE) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Returns the (topleft, botright) of the square patch of half width size centered on loc."""
+        x, y = int(loc[0]), int(loc[1])
+
+        return (max(0, x - size), max(0, y - size)), (x + size, y + size)
+
+
+    async def wait_change(self, screen: ScreenHandler, region: Tuple[Tuple[int, int], Tuple[int, int]],
+    before: "image", timeout: float = DEFAULT_ACK_TIMEOUT) -> bool:
+        """Returns True as soon as region of the screen differs from before, or False after timeout seconds."""
+        end = time.time() + timeout
+
+        while time.time() < end:
+            await asyncio.sleep(self.ACK_POLL_RATE)
+            after = screen.get_screen(*region)
+
+            if after.shape != before.shape or np.mean(cv2.absdiff(before, after)) >= self.ACK_DIFF_THRESHOLD:
+                return True
+
+        return False
+
+
+    async def click(self, loc: Tuple[int, int], delay: float = DEFAULT_CLICK_DELAY, left_click: bool = True,
+    ack_screen: ScreenHandler = None, expected_region: Tuple[Tuple[int, int], Tuple[int, int]] = None,
+    ack_timeout: float = DEFAULT_ACK_TIMEOUT) -> "asyncio.Task or None":
         """Clicks on the provided coordinate on the screen, with the provided delay between
-        pressing down and lifting up."""
+        pressing down and lifting up.
+        If ack_screen is provided, returns a task that resolves to True once the clicked region (or expected_region,
+        as (topleft, botright)) visibly changes, or to False if it doesn't change within ack_timeout seconds."""
         #print(f"Location is {loc}.")
+        if ack_screen is not None:
+            # hover first, so that hover highlighting isn't mistaken for the click landing
+            pyautogui.moveTo(*loc)
+            await asyncio.sleep(delay)
+
+            region = expected_region if expected_region is not None else self.region_around(loc)
+            before = ack_screen.get_screen(*region)
 
         if left_click:
             pyautogui.mouseDown(*loc, button='left')
             await asyncio.sleep(delay)
             pyautogui.mouseUp(button='left')
 
-    
-    async def find_click(self, screen: ScreenHandler,img_name: str, 
-    x_delta: float = 0, y_delta: float = 0, threshold: float = 0.9) -> bool:
+        if ack_screen is not None:
+            return asyncio.create_task(self.wait_change(ack_screen, region, before, ack_timeout))
+
+
+    async def find(self, screen: ScreenHandler, img_name: str, x_delta: float = 0, y_delta: float = 0,
+    threshold: float = 0.9) -> Tuple[int, int] or None:
+        """Returns the point find_click would click on, or None if the image can't be found."""
+        res = await screen.screen_find(img_name, threshold)
+
+        if res is None:
+            return None
+
+        return res[0] + res[2]//2 + x_delta, res[1] + res[3]//2 + y_delta
+
+
+    async def find_click(self, screen: ScreenHandler,img_name: str,
+    x_delta: float = 0, y_delta: float = 0, threshold: float = 0.9, ack: bool = False,
+    expected_region: Tuple[Tuple[int, int], Tuple[int, int]] = None) -> bool or "asyncio.Task":
         """Finds the given image and clicks on the center of it, or a point away from the center
         by x_delta and y_delta. For example, will click on (100,100) if the image's center is there,
         or (120, 120) if x_delta = 20 and y_delta = 20.
         Returns True if successfully clicked, otherwise False.
+        If ack is True, returns the acknowledgement task of click() instead of True.
         """
-        res = await screen.screen_find(img_name, threshold)
+        loc = await self.find(screen, img_name, x_delta = x_delta, y_delta = y_delta, threshold = threshold)
 
-        if res is None:
+        if loc is None:
             return False
 
-        x = res[0] + res[2]//2 + x_delta
-        y = res[1] + res[3]//2 + y_delta
+        ack_task = await self.click(loc, ack_screen = screen if ack else None, expected_region = expected_region)
 
-        await self.click((x, y))
+        return ack_task if ack else True
 
-        return True
 
-    
     async def wait_click(self, screen: ScreenHandler, img_name: str, x_delta: float = 0, y_delta: float = 0,
-    threshold: float = 0.9, retry_delay: float = DEFAULT_RETRY_DELAY) -> None:
+    threshold: float = 0.9, retry_delay: float = DEFAULT_RETRY_DELAY, ack: bool = False,
+    expected_region: Tuple[Tuple[int, int], Tuple[int, int]] = None, retries: int = DEFAULT_ACK_RETRIES,
+    rounds: int = DEFAULT_ACK_ROUNDS, ack_timeout: float = DEFAULT_ACK_TIMEOUT, timeout: float = None) -> bool:
         """Similar to find_click, but stalls with asyncio.sleep() until a click is successfully inputted on the
-        provided image."""
-        while not await self.find_click(screen, img_name, x_delta = x_delta, y_delta = y_delta, threshold = threshold):
-            await asyncio.sleep(retry_delay)
\ No newline at end of file
+        provided image.
+        If ack is True, also waits until the click is acknowledged (refer to click()). Unacknowledged clicks are
+        repeated on the same point up to retries times before the image is searched for again, and the search is
+        given up after rounds such rounds.
+        If timeout is provided, the image is only searched for during timeout seconds.
+        Returns True once clicked (and acknowledged), or False if the clicks were never acknowledged or the image
+        wasn't found in time."""
+        unacked_rounds = 0
+        end = None if timeout is None else time.time() + timeout
+
+        while True:
+            loc = await self.find(screen, img_name, x_delta = x_delta, y_delta = y_delta, threshold = threshold)
+
+            if loc is not None:
+                if not ack:
+                    await self.click(loc)
+                    return True
+
+                for _ in range(retries + 1):
+                    acked = await self.click(loc, ack_screen = screen, expected_region = expected_region,
+                    ack_timeout = ack_timeout)
+                    if await acked:
+                        return True
+
+                unacked_rounds += 1
+                if unacked_rounds >= rounds:
+                    return False
+
+            if end is not None and time.time() >= end:
+                return False
+
+            await asyncio.sleep(retry_delay)
@@ -1,5 +1,10 @@
 from enum import Enum
-from typing import Set
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Set
 
 class LFlag(Enum):
     """The LFlag Enum represents different kinds of debugging/logger flags."""
@@ -9,25 +14,162 @@ class LFlag(Enum):
 
 
 class Logger:
-    """The Logger class is used to log/debug things."""
-    def __init__(self, enabled: bool = True, flags: LFlag or Set[LFlag] = None):
+    """The Logger class is used to log/debug things.
+    In structured mode (log_path provided), records are queued and written in batches to a rotating
+    line-delimited JSON file by a background thread, so logging never waits on I/O."""
+    DEFAULT_QUEUE_SIZE = 10000
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+    DEFAULT_BACKUPS = 3
+    FLUSH_RATE = 0.5 # seconds the writer waits for records before flushing what it has
+
+    def __init__(self, enabled: bool = True, flags: LFlag or Set[LFlag] = None, log_path: str = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE, max_bytes: int = DEFAULT_MAX_BYTES, backups: int = DEFAULT_BACKUPS):
         """
         Parameters:
             - enabled: If disabled, print statements and other logging commands won't do anything when executed.
             - flags: Flags (associated with types of information) to examine. If None, all output is allowed.
+            - log_path: File structured records are written to. If None, records are printed instead.
+            - queue_size: Records that can be waiting to be written. Records are dropped (and counted) when it is full.
+            - max_bytes: Size the log file can grow to before being rotated (log_path.1, log_path.2, ...).
+            - backups: Amount of rotated log files kept.
         """
         self.enabled = enabled
         self.flags = set([flags]) if type(flags) is LFlag else flags
 
+        # set by the bot every step, attached to every structured record
+        self.tick: int = 0
+
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.written: int = 0
+        self.dropped: int = 0
+
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._writer: threading.Thread = None
+        if enabled and log_path is not None:
+            self._writer = threading.Thread(target = self._write_loop, name = "Logger", daemon = True)
+            self._writer.start()
+
+
+    def allowed(self, flags: LFlag or Set[LFlag] = None) -> bool:
+        """Returns True if output with the given flags would be shown. Use it to avoid building expensive messages
+        that would be thrown away."""
+        if not self.enabled:
+            return False
+
+        if self.flags is not None and flags is not None:
+            return flags in self.flags if type(flags) is LFlag else (True if self.flags & flags else False)
+
+        return True
+
 
     def print(self, string: str, flags: LFlag or Set[LFlag] = None):
         """Prints the given string to the console, if at least one of the flags provided is being examined
         by the logger.
-        If no flags are provided, then the string is unconditionally printed."""
-        if self.enabled:
-            correct_flag = True
-            if self.flags is not None and flags is not None:
-                correct_flag = flags in self.flags if type(flags) is LFlag else (True if self.flags & flags else False)
-            
-            if correct_flag:
-                print(string)
\ No newline at end of file
+        If no flags are provided, then the string is unconditionally printed.
+        In structured mode, the string is logged as a record instead."""
+        if self.allowed(flags):
+            if self._writer is not None:
+                self._put(flags, "print", {"msg": string})
+            else:
+                print(string)
+
+
+    def report(self, string: str) -> None:
+        """Shows the given string even if the logger is disabled (for information the user always wants, like
+        match statistics). In structured mode, it is also logged as a record."""
+        print(string)
+        if self._writer is not None:
+            self._put(None, "report", {"msg": string})
+
+
+    def log(self, flags: LFlag or Set[LFlag], event: str, **fields: Any) -> None:
+        """Logs a structured record of event with the given fields, if the flags are being examined.
+        Without a log file, the record is printed.
+        Fields are evaluated by the caller before the flags are checked; guard expensive ones with allowed()."""
+        if not self.allowed(flags):
+            return
+
+        if self._writer is not None:
+            self._put(flags, event, fields)
+        else:
+            print(f"{event}: {fields}")
+
+
+    def _put(self, flags: LFlag or Set[LFlag], event: str, fields: dict) -> None:
+        """Queues a record for the writer thread, dropping it if the queue is full."""
+        flag = flags.name if type(flags) is LFlag else (sorted(flag.name for flag in flags) if flags else None)
+
+        try:
+            self._queue.put_nowait((time.time(), self.tick, flag, event, fields))
+        except queue.Full:
+            self.dropped += 1
+
+
+    def _rotate(self, file) -> "file":
+        """Closes file, shifts the rotated log files by one and returns a new log file."""
+        file.close()
+
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.log_path}.{i}"):
+                os.replace(f"{self.log_path}.{i}", f"{self.log_path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.log_path, f"{self.log_path}.1")
+        else:
+            os.remove(self.log_path)
+
+        return open(self.log_path, "a")
+
+
+    def _write_loop(self) -> None:
+        """Writer thread: writes queued records in batches until close() is called."""
+        file = open(self.log_path, "a")
+        running = True
+
+        while running:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout = self.FLUSH_RATE))
+                while len(batch) < self.DEFAULT_BATCH_SIZE:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            # None is put on the queue by close()
+            if None in batch:
+                running = False
+                batch = [record for record in batch if record is not None]
+
+            if batch:
+                lines = []
+                for t, tick, flag, event, fields in batch:
+                    record = {"t": round(t, 4), "tick": tick, "flag": flag, "event": event}
+                    record.update(fields)
+                    lines.append(json.dumps(record, separators = (",", ":"), default = str))
+
+                file.write("\n".join(lines) + "\n")
+                file.flush()
+                self.written += len(batch)
+
+                if file.tell() >= self.max_bytes:
+                    file = self._rotate(file)
+
+        file.close()
+
+
+    def close(self) -> None:
+        """Writes every queued record and stops the writer thread."""
+        if self._writer is not None:
+            # waits for room if the queue is full, so that the stop signal isn't dropped,
+            # unless the writer died and nothing will ever make room
+            while self._writer.is_alive():
+                try:
+                    self._queue.put(None, timeout = self.FLUSH_RATE)
+                    break
+                except queue.Full:
+                    pass
+
+            self._writer.join()
+            self._writer = None
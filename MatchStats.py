@@ -0,0 +1,86 @@
+from collections import defaultdict
+import time
+from typing import Dict, List
+
+from constants import MatchResult, MenuState
+
+
+class MatchRecord:
+    """The MatchRecord class stores the outcome of a single match."""
+    def __init__(self, result: MatchResult, start: float, duration: float):
+        """
+        Params:
+            result: How the match ended.
+            start: time.time() at which the match started (after loading).
+            duration: Length of the match in seconds.
+        """
+        self.result = result
+        self.start = start
+        self.duration = duration
+
+
+class MatchStats:
+    """The MatchStats class keeps track of match results and where the bot spends its time,
+    which is used to measure throughput (games per hour)."""
+    MENU_STATES = (MenuState.Main, MenuState.Custom, MenuState.Race, MenuState.PostGame)
+
+    def __init__(self):
+        self.start_time: float = time.time()
+        self.records: List[MatchRecord] = []
+        self.state_time: Dict[MenuState, float] = defaultdict(float)
+
+        self._match_start: float = None
+
+
+    def add_state_time(self, state: MenuState, seconds: float) -> None:
+        """Adds the given amount of seconds to the time spent in state."""
+        self.state_time[state] += seconds
+
+
+    def start_match(self) -> None:
+        """Marks the start of a match (when the loading screen finishes)."""
+        self._match_start = time.time()
+
+
+    def in_match(self) -> bool:
+        """Returns True if a match has been started but not ended."""
+        return self._match_start is not None
+
+
+    def end_match(self, result: MatchResult) -> MatchRecord:
+        """Records the end of the current match with the provided result, returning its record."""
+        end = time.time()
+        start = self._match_start if self._match_start is not None else end
+
+        record = MatchRecord(result, start, end - start)
+        self.records.append(record)
+        self._match_start = None
+
+        return record
+
+
+    def games_per_hour(self) -> float:
+        """Returns the number of finished games per hour since the stats were created."""
+        hours = (time.time() - self.start_time) / 3600
+
+        return len(self.records) / hours if hours > 0 else 0.0
+
+
+    def menu_time(self) -> float:
+        """Returns the total seconds spent in menus (main, custom, race selection, post game)."""
+        return sum(self.state_time[state] for state in self.MENU_STATES)
+
+
+    def loading_time(self) -> float:
+        """Returns the total seconds spent on loading screens."""
+        return self.state_time[MenuState.Loading]
+
+
+    def summary(self) -> str:
+        """Returns a one line summary of the stats."""
+        wins = sum(1 for record in self.records if record.result == MatchResult.Victory)
+        losses = sum(1 for record in self.records if record.result == MatchResult.Defeat)
+
+        return (f"{len(self.records)} games ({wins}W/{losses}L), {self.games_per_hour():.2f} games/hour, "
+        f"{self.menu_time():.1f}s in menus, {self.loading_time():.1f}s loading, "
+        f"{self.state_time[MenuState.Playing]:.1f}s playing.")
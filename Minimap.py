@@ -0,0 +1,114 @@
+from typing import NamedTuple, Tuple
+
+import cv2
+import numpy as np
+
+from constants import MINIMAP_COLORS, MINIMAP_OFFSET, MINIMAP_STATUES
+
+
+class MinimapState(NamedTuple):
+    """The MinimapState class is what the MinimapReader read from the minimap on one frame.
+    Unit densities are fractions of each lane bin's pixels covered by units, from the left of the map to the right."""
+    friendly: np.ndarray
+    enemy: np.ndarray
+    # (left, right) edges of the camera as fractions of the minimap width, None if not found
+    camera: Tuple[float, float] = None
+    # 1 if the center statue is controlled by the bot, -1 if by the enemy, 0 if neutral
+    center: int = 0
+    # whether the (left, right) statues are still standing
+    statues: Tuple[bool, bool] = (True, True)
+
+
+class MinimapReader:
+    """The MinimapReader class reads unit positions, the camera position and statue state from the minimap
+    part of a frame, using color masks. The minimap is located relative to an anchor image (see MINIMAP_ANCHOR)."""
+    DEFAULT_BINS = 32
+    # fraction of pixels in a column that have to be the camera color for the column to be part of the camera outline
+    CAMERA_COLUMN_THRESHOLD = 0.5
+    # fraction of a statue's pixels of one side's color needed for that side to control it
+    CENTER_THRESHOLD = 0.05
+    # fraction of a statue's pixels of the statue color needed for it to be standing
+    STATUE_THRESHOLD = 0.1
+
+    def __init__(self, offset: Tuple[int, int, int, int] = MINIMAP_OFFSET, bins: int = DEFAULT_BINS,
+    anchor: Tuple[int, int] = None):
+        """
+        Params:
+            offset: (left, top, right, bottom) of the minimap, in pixels from anchor. Default: MINIMAP_OFFSET
+            bins: Amount of bins the lane is split into for unit densities. Default: 32
+            anchor: (x, y) of the top left of the anchor image on the frame. Default: None (not located yet)
+        """
+        self.offset = offset
+        self.bins = bins
+        self.anchor = anchor
+
+
+    def crop(self, frame: "image") -> "image":
+        """Returns the minimap part of frame (a view, not a copy)."""
+        x, y = self.anchor
+        left, top, right, bottom = self.offset
+
+        return frame[max(0, y + top):max(0, y + bottom), max(0, x + left):max(0, x + right)]
+
+
+    @staticmethod
+    def mask(minimap: "image", color: str) -> np.ndarray:
+        """Returns a boolean mask of the minimap pixels within the MINIMAP_COLORS range of color."""
+        low, high = MINIMAP_COLORS[color]
+
+        return cv2.inRange(minimap, low, high) > 0
+
+
+    def density(self, mask: np.ndarray) -> np.ndarray:
+        """Returns the fraction of set pixels in each of the lane bins of mask."""
+        h, w = mask.shape
+        column_bins = np.arange(w) * self.bins // max(w, 1)
+
+        counts = np.bincount(column_bins, weights = mask.sum(axis = 0), minlength = self.bins)
+        pixels = np.bincount(column_bins, minlength = self.bins) * h
+
+        return counts / np.maximum(pixels, 1)
+
+
+    @staticmethod
+    def statue(mask: np.ndarray, name: str) -> np.ndarray:
+        """Returns the columns of mask covering the statue name (see MINIMAP_STATUES)."""
+        w = mask.shape[1]
+        left, right = MINIMAP_STATUES[name]
+
+        return mask[:, int(left * w):max(int(left * w) + 1, int(right * w))]
+
+
+    def read(self, frame: "image") -> MinimapState:
+        """Reads the minimap of frame. Returns None if the minimap hasn't been located (anchor is None)."""
+        if self.anchor is None:
+            return None
+
+        minimap = self.crop(frame)
+        h, w = minimap.shape[:2]
+        if h == 0 or w == 0:
+            return None
+
+        friendly = self.mask(minimap, "friendly")
+        enemy = self.mask(minimap, "enemy")
+        statue = self.mask(minimap, "statue")
+
+        # the camera is drawn as a rectangle outline, so its vertical edges are columns full of the camera color
+        camera_columns = np.flatnonzero(self.mask(minimap, "camera").mean(axis = 0) >= self.CAMERA_COLUMN_THRESHOLD)
+        camera = (camera_columns[0] / w, (camera_columns[-1] + 1) / w) if camera_columns.size else None
+
+        # the center statue is drawn in the color of the side controlling it
+        friendly_center, enemy_center = self.statue(friendly, "center").mean(), self.statue(enemy, "center").mean()
+        if max(friendly_center, enemy_center) < self.CENTER_THRESHOLD:
+            center = 0
+        else:
+            center = 1 if friendly_center > enemy_center else -1
+
+        statues = tuple(bool(self.statue(statue, name).mean() >= self.STATUE_THRESHOLD) for name in ("left", "right"))
+
+        friendly_density, enemy_density = self.density(friendly), self.density(enemy)
+        # the state is published in immutable snapshots
+        friendly_density.flags.writeable = False
+        enemy_density.flags.writeable = False
+
+        return MinimapState(friendly_density, enemy_density, camera, center, statues)
@@ -0,0 +1,182 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from Logger import LFlag, Logger
+from Minimap import MinimapState
+from ScreenHandler import ScreenHandler
+
+
+class GameSnapshot(NamedTuple):
+    """The GameSnapshot class is an immutable view of what the bot last saw on screen.
+    A new snapshot (with a higher version) is published every time a detector produces new information."""
+    version: int = 0
+    timestamp: float = 0.0
+    gold: int = 0
+    # mana and supply aren't read from the screen yet
+    mana: int = 0
+    supply: Optional[int] = None
+    on_left: bool = True
+    # image name -> (x, y, width, height) of HUD anchors (gold, mana, supply images)
+    anchors: Mapping[str, Tuple[int, int, int, int]] = MappingProxyType({})
+    # (digit, x, y, width, height) of the digits gold was read from
+    digits: Tuple[Tuple[str, int, int, int, int], ...] = ()
+    # (image name, x, y) of every unit found
+    units: Tuple[Tuple[str, int, int], ...] = ()
+    # names of menu buttons currently visible
+    menu: Tuple[str, ...] = ()
+    minimap: Optional[MinimapState] = None
+
+
+class Detector:
+    """The Detector class represents one piece of perception (for example reading gold) and how often it is run."""
+    def __init__(self, name: str, func: Callable[["image"], Dict[str, Any]], rate: float,
+    active: Callable[[], bool] = None, apply: Callable[[Dict[str, Any]], None] = None,
+    prepare: Callable[[], None] = None):
+        """
+        Params:
+            name: Name of the detector.
+            func: Function that takes the current frame and returns the GameSnapshot fields it updates.
+            Runs on the perception thread, so it shouldn't change bot state.
+            rate: Minimum amount of seconds between runs.
+            active: Function returning whether the detector should currently run. Default: None (always run)
+            apply: Function called on the event loop with func's result, before it is published. It may update
+            bot state and add or change fields. Default: None
+            prepare: Function called on the event loop right before the frame func runs on is captured, for example
+            to note the bot state the frame corresponds to. Default: None
+        """
+        self.name = name
+        self.func = func
+        self.rate = rate
+        self.active = active
+        self.apply = apply
+        self.prepare = prepare
+        self.last_run: float = 0.0
+        self.errors: int = 0
+
+
+    def due(self, now: float) -> bool:
+        """Returns True if the detector should be run at time now."""
+        if self.active is not None and not self.active():
+            return False
+
+        return now - self.last_run >= self.rate
+
+
+class Perception:
+    """The Perception class continuously captures the screen in the background, runs detectors on the captured
+    frames at their own rates and publishes the results as GameSnapshots.
+    Capturing and detecting happen on a separate thread, so they don't hold up the event loop (on_step, actions)."""
+    DEFAULT_TICK_RATE = 0.1
+
+    def __init__(self, screen: ScreenHandler, logger: Logger, tick_rate: float = DEFAULT_TICK_RATE,
+    snapshot: GameSnapshot = None):
+        """
+        Params:
+            screen: ScreenHandler used to capture frames.
+            logger: Logger used for debug messages.
+            tick_rate: Seconds between captured frames. Default: 0.1 seconds
+            snapshot: Snapshot to start from. Default: None (empty snapshot)
+        """
+        self.screen = screen
+        self.logger = logger
+        self.tick_rate = tick_rate
+
+        self.detectors: List[Detector] = []
+        self.subscribers: List[Callable[["image", GameSnapshot], None]] = []
+
+        self._snapshot: GameSnapshot = snapshot if snapshot is not None else GameSnapshot(timestamp = time.time())
+        self._running: bool = False
+        # a single worker, so frames are detected on in order
+        self._executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "Perception")
+
+
+    @property
+    def snapshot(self) -> GameSnapshot:
+        """Latest published snapshot. Never blocks."""
+        return self._snapshot
+
+
+    def add_detector(self, name: str, func: Callable[["image"], Dict[str, Any]], rate: float,
+    active: Callable[[], bool] = None, apply: Callable[[Dict[str, Any]], None] = None,
+    prepare: Callable[[], None] = None) -> None:
+        """Adds a detector to the pipeline. Refer to the Detector class for parameters."""
+        self.detectors.append(Detector(name, func, rate, active, apply, prepare))
+
+
+    def subscribe(self, callback: Callable[["image", GameSnapshot], None]) -> None:
+        """Registers callback to be called with every captured frame and the snapshot produced from it."""
+        self.subscribers.append(callback)
+
+
+    def _detect(self, frame: "image", detectors: List[Detector]) -> Tuple["image", List[Tuple[Detector, Dict[str, Any]]]]:
+        """Runs on the perception thread: captures a frame if frame is None, then runs detectors on it.
+        A detector that raises is logged and skipped, the others still run."""
+        if frame is None:
+            try:
+                frame = self.screen.get_fullscreen()
+            except Exception as e:
+                self.logger.print(f"Perception: could not capture the screen: {e!r}")
+                return None, []
+
+        results = []
+        for detector in detectors:
+            try:
+                results.append((detector, detector.func(frame)))
+            except Exception as e:
+                detector.errors += 1
+                self.logger.print(f"Perception: {detector.name} detector failed ({detector.errors} times): {e!r}")
+
+        return frame, results
+
+
+    async def step(self, frame: "image" = None) -> GameSnapshot:
+        """Runs every due detector on frame (captures a new frame if None) and publishes the resulting snapshot.
+        Nothing is captured if no detector is due and nothing is subscribed."""
+        now = time.time()
+        due = [detector for detector in self.detectors if detector.due(now)]
+
+        if not due and not self.subscribers:
+            return self._snapshot
+
+        for detector in due:
+            detector.last_run = now
+            if detector.prepare is not None:
+                detector.prepare()
+
+        frame, results = await asyncio.get_running_loop().run_in_executor(self._executor, self._detect, frame, due)
+        if frame is None:
+            return self._snapshot
+
+        updates: Dict[str, Any] = {}
+        for detector, fields in results:
+            if detector.apply is not None:
+                detector.apply(fields)
+            updates.update(fields)
+
+        if updates:
+            self._snapshot = self._snapshot._replace(version = self._snapshot.version + 1, timestamp = now, **updates)
+            if self.logger.allowed(LFlag.Screen):
+                self.logger.log(LFlag.Screen, "Perception.step", version = self._snapshot.version, updated = list(updates))
+
+        for callback in self.subscribers:
+            callback(frame, self._snapshot)
+
+        return self._snapshot
+
+
+    async def run(self) -> None:
+        """Runs the pipeline until stop() is called."""
+        self._running = True
+
+        while self._running:
+            start = time.time()
+            await self.step()
+            await asyncio.sleep(max(0.0, self.tick_rate - (time.time() - start)))
+
+
+    def stop(self) -> None:
+        """Stops the pipeline after its current step."""
+        self._running = False
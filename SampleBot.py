@@ -12,10 +12,9 @@ class SampleBot(BotBase):
     async def on_step(self):
         ### build() example: alternate between making miners and swords 
         actions = []
-        
-        actions.append(Action(self.update_res))
 
-        if self.gold >= 150:
+        # resources are read in the background, self.snapshot has the latest ones
+        if self.snapshot.gold >= 150:
             if self.unit_val == 0:
                 actions.append(Action(self.build, UnitType.Miner))
                 self.unit_val = 1
@@ -33,7 +32,7 @@ class SampleBot(BotBase):
         if self.iteration != 0 and (self.iteration % (ITERATIONS_PER_ACTION * len(mass_actions))) == 0:
             self.on_left = False if self.on_left else True
 
-        actions.append(Action(self.mass, mass_actions[idx]))
+        actions.append(Action(self.mass, mass_actions[idx], key = "mass"))
 
         ### cleanup
 
@@ -1,6 +1,7 @@
 import asyncio
+import threading
 import time
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import cv2
 import numpy as np
@@ -8,19 +9,30 @@ from matplotlib import pyplot as plt
 from PIL import ImageGrab
 
 from constants import ImageName, THRESHOLDS_NUMS
+from TileCache import TileCache
 
 
 class ScreenHandler:
     """The ScreenHandler class handles actions relating to the screen."""
-    def __init__(self, topleft: Tuple[int, int], botright: Tuple[int, int]):
+    def __init__(self, topleft: Tuple[int, int], botright: Tuple[int, int], tile_size: int = TileCache.DEFAULT_TILE_SIZE):
         """
         Params:
             topleft: Coordinates of the top left corner of the screen.
             botright: Coordinates of the bottom right corner of the screen.
+            tile_size: Size of the tiles used to only rematch parts of the screen that changed. Default: 32 pixels
         """
         self.topleft = topleft
         self.botright = botright
 
+        self.tiles: TileCache = TileCache(tile_size)
+        self._templates: Dict[str, "image"] = {}
+
+        # the last screen searched, with its processed versions and their tile signatures by blackwhite threshold,
+        # so searching one frame for many images only processes it once
+        self._processed_screen: "image" = None
+        self._processed: Dict[int, Tuple["image", np.ndarray]] = {}
+        self._processed_lock = threading.Lock()
+
     
     def get_fullscreen(self) -> "image":
         """Returns the entire screen the bot sees."""
@@ -35,8 +47,22 @@ class ScreenHandler:
 
         return screen
 
+
+    def crop(self, screen: "image", topleft: Tuple[int, int], botright: Tuple[int, int]) -> "image":
+        """Returns the part of an already captured screen contained within the given coordinates."""
+        x0, y0 = max(0, int(topleft[0])), max(0, int(topleft[1]))
+        x1, y1 = int(botright[0]), int(botright[1])
+
+        return screen[y0:y1, x0:x1]
+
     
     async def screen_find(self, img_name: str, threshold: float = 0.9, all_imgs: bool = False,
+    blackwhite: int = 0, screen: "image" = None) -> Tuple[int, int, int, int] or Tuple[List[int], List[int], int, int]:
+        """Asynchronous version of find()."""
+        return self.find(img_name, threshold, all_imgs, blackwhite, screen)
+
+
+    def find(self, img_name: str, threshold: float = 0.9, all_imgs: bool = False,
     blackwhite: int = 0, screen: "image" = None) -> Tuple[int, int, int, int] or Tuple[List[int], List[int], int, int]:
         """Finds the given image and returns its x coord, y coord, width, and height.
         If a match cannot be found, returns None.
@@ -51,14 +77,13 @@ class ScreenHandler:
         if screen is None:
             screen = self.get_fullscreen()
         
-        screen = cv2.cvtColor(screen, cv2.COLOR_RGB2GRAY)
-        if blackwhite:
-            _, screen = cv2.threshold(screen, blackwhite, 255, cv2.THRESH_BINARY)
+        screen, signature = self.process(screen, blackwhite)
 
-        template = cv2.imread(img_name, cv2.IMREAD_GRAYSCALE)
+        template = self.get_template(img_name)
         w, h = template.shape[::-1]
 
-        res = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        # only the tiles that changed since this image was last searched for (with the same filter) are rematched
+        res = self.tiles.match((img_name, blackwhite), screen, template, signature)
         threshold = threshold
         loc = np.where(res >= threshold)
 
@@ -70,6 +95,39 @@ class ScreenHandler:
                 return [loc[1][0], loc[0][0], w, h]
 
 
+    def process(self, screen: "image", blackwhite: int = 0) -> Tuple["image", np.ndarray]:
+        """Returns screen converted to grayscale (and black and white if blackwhite is set) with its tile signature.
+        The result is reused while the same screen object keeps being passed in."""
+        with self._processed_lock:
+            if self._processed_screen is not screen:
+                self._processed_screen, self._processed = screen, {}
+            processed = self._processed.get(blackwhite)
+
+        if processed is None:
+            gray = cv2.cvtColor(screen, cv2.COLOR_RGB2GRAY)
+            if blackwhite:
+                _, gray = cv2.threshold(gray, blackwhite, 255, cv2.THRESH_BINARY)
+            processed = (gray, self.tiles.signature(gray))
+
+            with self._processed_lock:
+                if self._processed_screen is screen:
+                    self._processed[blackwhite] = processed
+
+        return processed
+
+
+    def get_template(self, img_name: str) -> "image":
+        """Returns the grayscale image of img_name, only reading it from disk the first time.
+        Raises FileNotFoundError if img_name can't be read."""
+        if img_name not in self._templates:
+            template = cv2.imread(img_name, cv2.IMREAD_GRAYSCALE)
+            if template is None:
+                raise FileNotFoundError(f"Could not read template image {img_name}")
+            self._templates[img_name] = template
+
+        return self._templates[img_name]
+
+
     def highlightMatching(self, screen, screen_match, img_name, threshold: float = 0.9) -> None:
         """Highlights the provided image of img_name where it is found on screen_match,
         on screen (in case screen_match is different, for example grayscale or black and white)."""
@@ -0,0 +1,123 @@
+import threading
+from typing import Dict, Hashable, List, Tuple
+
+import cv2
+import numpy as np
+
+
+class TileCache:
+    """The TileCache class caches template matching results, only rematching the parts of a screen
+    that changed since the last time the same template was matched on a screen of the same size.
+    The screen is split into square tiles, each summarized by a signature (a weighted sum of its pixels);
+    a tile is dirty if its signature changed."""
+    DEFAULT_TILE_SIZE = 32
+    # once rematching the dirty rectangles would cover this fraction of the screen, the whole screen is matched
+    # instead (one matchTemplate call is cheaper than several overlapping ones)
+    FULL_MATCH_FRACTION = 0.5
+
+    def __init__(self, tile_size: int = DEFAULT_TILE_SIZE):
+        """
+        Params:
+            tile_size: Width and height of a tile, in pixels. Default: 32
+        """
+        self.tile_size = tile_size
+        # odd weights (mod 2^64) make any change to a single pixel change the tile's signature
+        rng = np.random.default_rng(0)
+        self._weights = rng.integers(0, 2**63, (tile_size, tile_size), dtype = np.uint64) | np.uint64(1)
+        # key -> (shape and signature of the screen the result was computed on, matchTemplate result)
+        self._entries: Dict[Hashable, Tuple[Tuple[int, ...], np.ndarray, np.ndarray]] = {}
+        # results may be matched from the event loop and the perception thread at the same time
+        self._lock = threading.Lock()
+
+
+    def clear(self) -> None:
+        """Forgets every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+
+    def signature(self, screen: "image") -> np.ndarray:
+        """Returns the signature grid (tile rows x tile columns) of a processed (single channel) screen.
+        Meant to be computed once per frame and passed to match() for every template."""
+        t = self.tile_size
+        h, w = screen.shape[:2]
+        rows, cols = -(-h // t), -(-w // t)
+
+        # pad to a whole number of tiles so the tiles can be reduced with a single reshape
+        if (rows * t, cols * t) != (h, w):
+            padded = np.zeros((rows * t, cols * t), dtype = screen.dtype)
+            padded[:h, :w] = screen
+        else:
+            padded = screen
+
+        return np.einsum("iajb,ab->ij", padded.reshape(rows, t, cols, t), self._weights,
+        dtype = np.uint64, casting = "unsafe")
+
+
+    def dirty_tiles(self, prev: np.ndarray, signature: np.ndarray) -> np.ndarray:
+        """Returns a boolean grid marking the tiles whose signature differs between prev and signature."""
+        return prev != signature
+
+
+    def _dirty_rects(self, dirty: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Returns (first row, first column, last row + 1, last column + 1) of the bounding rectangle of every group
+        of touching dirty tiles."""
+        count, _, stats, _ = cv2.connectedComponentsWithStats(dirty.astype(np.uint8), connectivity = 8)
+
+        # label 0 is the clean background
+        return [(int(y), int(x), int(y + h), int(x + w)) for x, y, w, h, _ in stats[1:count]]
+
+
+    def match(self, key: Hashable, screen: "image", template: "image", signature: np.ndarray = None) -> np.ndarray:
+        """Returns cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED), reusing the result cached under key
+        for tiles that did not change.
+        Params:
+            key: Identifies the template and how screen was processed (for example image name and blackwhite).
+            screen: Processed (grayscale or black and white) screen.
+            template: Template to match.
+            signature: signature() of screen. Default: None (computed)"""
+        if signature is None:
+            signature = self.signature(screen)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None or entry[0] != screen.shape:
+            res = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+            with self._lock:
+                self._entries[key] = (screen.shape, signature, res)
+            return res
+
+        _, prev, res = entry
+        dirty = self.dirty_tiles(prev, signature)
+
+        if dirty.any():
+            t = self.tile_size
+            th, tw = template.shape[:2]
+            res_h, res_w = res.shape
+
+            windows = []
+            for row0, col0, row1, col1 in self._dirty_rects(dirty):
+                # every match position whose window overlaps the dirty tiles, including matches that
+                # start in a clean tile to the left of/above the rectangle and straddle into it
+                y0, y1 = max(0, row0 * t - th + 1), min(res_h, row1 * t)
+                x0, x1 = max(0, col0 * t - tw + 1), min(res_w, col1 * t)
+
+                if y0 < y1 and x0 < x1:
+                    windows.append((y0, y1, x0, x1))
+
+            # pixels the partial rematch would run over
+            cost = sum((y1 - y0 + th - 1) * (x1 - x0 + tw - 1) for y0, y1, x0, x1 in windows)
+
+            if cost >= self.FULL_MATCH_FRACTION * screen.shape[0] * screen.shape[1]:
+                res = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+            else:
+                res = res.copy()
+                for y0, y1, x0, x1 in windows:
+                    region = screen[y0:y1 + th - 1, x0:x1 + tw - 1]
+                    res[y0:y1, x0:x1] = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+
+        with self._lock:
+            self._entries[key] = (screen.shape, signature, res)
+
+        return res
@@ -0,0 +1,122 @@
+from collections import deque
+import threading
+import time
+from typing import Deque, List, Tuple
+
+import cv2
+
+from Action import Action
+from Perception import GameSnapshot
+
+
+class Visualizer:
+    """The Visualizer class shows the frames the perception pipeline captured, with what was detected on them
+    (HUD anchors, digits, units), the last actions and tick timing drawn on top.
+    Drawing and showing happen on a separate thread at a throttled frame rate; publishing only stores a reference
+    to the latest frame, so the bot isn't slowed down."""
+    DEFAULT_FPS = 10
+    WINDOW_NAME = "bot"
+    ACTIONS_SHOWN = 5
+
+    ANCHOR_COLOR = (0, 255, 255)
+    DIGIT_COLOR = (0, 255, 0)
+    UNIT_COLOR = (0, 0, 255)
+    TEXT_COLOR = (255, 255, 255)
+
+    def __init__(self, fps: float = DEFAULT_FPS):
+        """
+        Params:
+            fps: Most frames shown per second. Default: 10
+        """
+        self.fps = fps
+
+        self._lock = threading.Lock()
+        self._latest: Tuple["image", GameSnapshot] = None
+        self._actions: Deque[Tuple[float, str]] = deque(maxlen = self.ACTIONS_SHOWN)
+        self._tick: float = 0.0
+
+        self._thread: threading.Thread = None
+        self._running: bool = False
+
+
+    def publish(self, frame: "image", snapshot: GameSnapshot) -> None:
+        """Sets the frame and snapshot to show next. Older frames that weren't shown yet are dropped.
+        Meant to be subscribed to the perception pipeline."""
+        with self._lock:
+            self._latest = (frame, snapshot)
+
+
+    def mark_actions(self, actions: List[Action]) -> None:
+        """Adds actions that were just run to the ones shown."""
+        now = time.time()
+        with self._lock:
+            self._actions.extend((now, repr(action)) for action in actions)
+
+
+    def record_tick(self, seconds: float) -> None:
+        """Sets the duration of the last bot step shown."""
+        self._tick = seconds
+
+
+    def start(self) -> None:
+        """Starts showing frames on a separate thread."""
+        self._running = True
+        self._thread = threading.Thread(target = self._show_loop, name = "Visualizer", daemon = True)
+        self._thread.start()
+
+
+    def stop(self) -> None:
+        """Stops showing frames and closes the window."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def draw(self, frame: "image", snapshot: GameSnapshot, actions: List[Tuple[float, str]]) -> "image":
+        """Returns a copy of frame with the snapshot's detections, actions and timing drawn on it."""
+        img = frame.copy()
+
+        for name, (x, y, w, h) in snapshot.anchors.items():
+            cv2.rectangle(img, (int(x), int(y)), (int(x + w), int(y + h)), self.ANCHOR_COLOR, 2)
+            cv2.putText(img, name, (int(x), int(y) - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.ANCHOR_COLOR, 1)
+
+        for num, x, y, w, h in snapshot.digits:
+            cv2.rectangle(img, (int(x), int(y)), (int(x + w), int(y + h)), self.DIGIT_COLOR, 1)
+            cv2.putText(img, num, (int(x), int(y + h) + 12), cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.DIGIT_COLOR, 1)
+
+        for name, x, y in snapshot.units:
+            cv2.circle(img, (int(x), int(y)), 6, self.UNIT_COLOR, 2)
+
+        now = time.time()
+        lines = [f"gold {snapshot.gold} mana {snapshot.mana} | tick {self._tick * 1000:.0f}ms | "
+        f"snapshot {snapshot.version} ({(now - snapshot.timestamp) * 1000:.0f}ms old)"]
+        lines += [f"-{now - t:.1f}s {action}" for t, action in actions]
+
+        for i, line in enumerate(lines):
+            cv2.putText(img, line, (5, 15 + 15 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.TEXT_COLOR, 1)
+
+        return img
+
+
+    def _show_loop(self) -> None:
+        """Visualizer thread: shows the latest published frame, at most fps times per second."""
+        shown = None
+
+        while self._running:
+            start = time.time()
+
+            with self._lock:
+                latest, actions = self._latest, list(self._actions)
+
+            if latest is not None and latest is not shown:
+                shown = latest
+                cv2.imshow(self.WINDOW_NAME, self.draw(*latest, actions))
+
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+            time.sleep(max(0.0, 1 / self.fps - (time.time() - start)))
+
+        cv2.destroyAllWindows()
+        self._running = False
@@ -5,6 +5,7 @@ class AutoPlay(Enum):
     """The AutoPlay enum represents autoplay options for the bot."""
     Manual = 0
     EasyChaos = 1
+    Ladder = 2
 
 
 """The ImageName dictionary contains the filenames of images used by the bot."""
@@ -40,12 +41,44 @@ ImageName = {
 
     "order": "images/Order Empire.PNG",
     "play_match": "images/Play Match.PNG",
+    "play_match_ladder": "images/Play Match Ladder.PNG",
     "supply": "images/supply count.png",
     "right_mass": "images/right_mass.PNG",
     "right_mass_miner": "images/right_mass_miner.PNG",
 
 
-    "500_swamp": "images/test/500_swamp_0.PNG"
+    "500_swamp": "images/test/500_swamp_0.PNG",
+    "mass_buttons": "images/test/mass_buttons_0.PNG"
+}
+
+
+"""MINIMAP_ANCHOR is the image the minimap is located from. The minimap sits right above the mass buttons."""
+MINIMAP_ANCHOR = "left_mass"
+
+
+"""MINIMAP_OFFSET is the (left, top, right, bottom) of the minimap, in pixels from the top left of MINIMAP_ANCHOR.
+Measured on images/test/mass_buttons_0.PNG."""
+MINIMAP_OFFSET = (-1, -38, 197, -4)
+
+
+"""MINIMAP_COLORS gives the (low, high) BGR color range of things drawn on the minimap.
+friendly and camera were measured on images/test/mass_buttons_0.PNG (a match played on the left, where the bot's
+units are red and the camera's edges are dark lines).
+TODO calibrate enemy and statue with a screenshot that shows them."""
+MINIMAP_COLORS = {
+    "friendly": ((0, 0, 180), (100, 90, 255)),
+    "enemy": ((150, 0, 0), (255, 120, 120)),
+    "camera": ((20, 18, 16), (40, 36, 34)),
+    "statue": ((0, 150, 200), (100, 230, 255))
+}
+
+
+"""MINIMAP_STATUES gives the (left, right) of each statue on the minimap, as fractions of the minimap width.
+TODO calibrate with a screenshot that shows them."""
+MINIMAP_STATUES = {
+    "left": (0.0, 0.04),
+    "center": (0.47, 0.53),
+    "right": (0.96, 1.0)
 }
 
 
@@ -58,6 +91,13 @@ class Mass(Enum):
     MinerAdvance = 4
 
 
+class MatchResult(Enum):
+    """The MatchResult enum represents how a match ended."""
+    Victory = 0
+    Defeat = 1
+    Unknown = 2
+
+
 class MenuState(Enum):
     """The MenuState enum represents different menus the bot can be in."""
     Main = 0
@@ -65,6 +105,7 @@ class MenuState(Enum):
     Race = 2
     Loading = 3
     Playing = 4
+    PostGame = 5
 
 """Threshold nums represents the thresholds necessary to detect certain numbers
 (using cv2.matchThreshold)."""
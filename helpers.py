@@ -1,4 +1,6 @@
 from collections import Counter
+from typing import List, Sequence, Tuple
+
 import cv2
 
 
@@ -16,4 +18,16 @@ def process_img(image):
     """Processes a normal image into an edges image."""
     processed_img = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     processed_img = cv2.Canny(processed_img, threshold1 = 100, threshold2 = 200)
-    return processed_img
\ No newline at end of file
+    return processed_img
+
+
+def group_points(xs: Sequence[int], ys: Sequence[int], w: int, h: int) -> List[Tuple[int, int]]:
+    """Groups template match locations that belong to the same object (within half a template width/height
+    of each other, since one object gives many adjacent matches), returning one location per object."""
+    groups: List[Tuple[int, int]] = []
+
+    for x, y in sorted(zip(xs, ys)):
+        if not any(abs(x - gx) <= w // 2 and abs(y - gy) <= h // 2 for gx, gy in groups):
+            groups.append((int(x), int(y)))
+
+    return groups
\ No newline at end of file
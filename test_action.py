@@ -0,0 +1,73 @@
+import asyncio
+
+from Action import Action, ActionScheduler
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+
+    async def click(self, *args):
+        self.calls.append(args)
+
+
+def test_no_args():
+    recorder = Recorder()
+    action = Action(recorder.click)
+
+    assert action.args is None
+    asyncio.run(action.run())
+    assert recorder.calls == [()]
+
+
+def test_coalesce_duplicates():
+    recorder = Recorder()
+    scheduler = ActionScheduler()
+    actions = [Action(recorder.click, 1, key = 1), Action(recorder.click, 2, key = 2), Action(recorder.click, 1, key = 1)]
+
+    asyncio.run(scheduler.run(actions))
+
+    assert recorder.calls == [(1,), (2,)]
+
+
+def test_keyless_not_merged():
+    recorder = Recorder()
+    scheduler = ActionScheduler()
+
+    asyncio.run(scheduler.run([Action(recorder.click, 1)] * 2))
+
+    assert recorder.calls == [(1,), (1,)]
+    assert scheduler.last_run == {}
+
+
+def test_custom_key():
+    recorder = Recorder()
+    scheduler = ActionScheduler()
+    actions = [Action(recorder.click, 1, key = "mass"), Action(recorder.click, 2, key = "mass")]
+
+    asyncio.run(scheduler.run(actions))
+
+    # latest submission wins
+    assert recorder.calls == [(2,)]
+
+
+def test_unhashable_key_not_merged():
+    recorder = Recorder()
+    scheduler = ActionScheduler()
+
+    asyncio.run(scheduler.run([Action(recorder.click, 1, key = [1]), Action(recorder.click, 1, key = [1])]))
+
+    assert recorder.calls == [(1,), (1,)]
+    assert scheduler.last_run == {}
+
+
+def test_cooldown():
+    recorder = Recorder()
+    scheduler = ActionScheduler()
+
+    asyncio.run(scheduler.run([Action(recorder.click, 1, key = 1, cooldown = 60)]))
+    asyncio.run(scheduler.run([Action(recorder.click, 1, key = 1, cooldown = 60)]))
+    asyncio.run(scheduler.run([Action(recorder.click, 2, key = 2, cooldown = 60)]))
+
+    assert recorder.calls == [(1,), (2,)]
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from constants import AutoPlay, MatchResult, MenuState
+from EmptyBot import EmptyBot
+
+
+@pytest.fixture
+def bot():
+    bot = EmptyBot((0, 0), (800, 800), state = MenuState.PostGame, autoplay_flg = AutoPlay.EasyChaos)
+    bot.POSTGAME_TIMEOUT = 1
+    bot.MENU_POLL_RATE = 0.01
+
+    return bot
+
+
+def test_game_over(bot):
+    bot._hud_seen = time.time() - bot.GAME_OVER_TIMEOUT + 1
+    assert not bot.game_over()
+
+    bot._hud_seen = time.time() - bot.GAME_OVER_TIMEOUT
+    assert bot.game_over()
+
+
+@pytest.mark.parametrize("on_left, statues, result", [
+    (True, (True, False), MatchResult.Victory),
+    (True, (False, True), MatchResult.Defeat),
+    (False, (True, False), MatchResult.Defeat),
+    (False, (False, True), MatchResult.Victory),
+    (True, (True, True), MatchResult.Unknown),
+    (False, (False, False), MatchResult.Unknown)
+])
+def test_match_result(bot, on_left, statues, result):
+    bot.STATUE_RESULTS = True
+    bot.on_left = on_left
+    bot._statues = statues
+
+    assert bot.match_result() == result
+
+
+def test_match_result_uncalibrated(bot):
+    bot._statues = (True, False)
+
+    assert bot.match_result() == MatchResult.Unknown
+
+
+def seen(bot, menu):
+    async def show():
+        await asyncio.sleep(0.05)
+        bot.menu, bot._menu_seen = menu, time.time()
+
+    async def run():
+        task = asyncio.create_task(show())
+        await bot.postgame_loop()
+        await task
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("menu, state", [
+    (("play_match",), MenuState.Custom),
+    (("custom",), MenuState.Main),
+    (("play_match_ladder",), MenuState.Main)
+])
+def test_postgame_menu(bot, menu, state):
+    seen(bot, menu)
+
+    assert bot.state == state
+
+
+def test_postgame_dismisses_then_times_out(bot):
+    clicks = []
+
+    async def click(loc, *args, **kwargs):
+        clicks.append(loc)
+    bot.input.click = click
+    bot.DISMISS_RATE = 10
+
+    seen(bot, ())
+
+    assert clicks == [(400, 400)]
+    assert bot.state == MenuState.Main
+
+
+def test_postgame_without_autoplay(bot):
+    bot.autoplay = None
+    asyncio.run(bot.postgame_loop())
+
+    assert bot.state == MenuState.Loading
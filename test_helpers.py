@@ -1,7 +1,7 @@
 """Pytest tests"""
 # TODO move tests to a testing folder
 
-from helpers import CounterLE
+from helpers import CounterLE, group_points
 
 
 
@@ -44,4 +44,14 @@ def test_bigger():
     a = CounterLE("5755")
     b = CounterLE("575")
 
-    assert not (a <= b)
\ No newline at end of file
+    assert not (a <= b)
+
+def test_group_points():
+    xs = [10, 11, 12, 10, 60, 61]
+    ys = [20, 20, 21, 22, 20, 21]
+
+    assert group_points(xs, ys, 20, 30) == [(10, 20), (60, 20)]
+
+
+def test_group_points_separate_rows():
+    assert len(group_points([10, 10], [0, 40], 20, 30)) == 2
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from History import RingBuffer, StateHistory
+
+
+def filled(values, size = 8):
+    buffer = RingBuffer(size)
+    for t, value in enumerate(values):
+        buffer.append(value, t)
+
+    return buffer
+
+
+def test_wraps_around():
+    buffer = filled(range(12), size = 5)
+    times, values = buffer.window()
+
+    assert len(buffer) == 5
+    assert list(values) == [7, 8, 9, 10, 11]
+    assert list(times) == [7, 8, 9, 10, 11]
+    assert buffer.latest().value == 11
+
+
+def test_window():
+    buffer = filled([500, 575, 650, 525, 600])
+
+    _, values = buffer.window(2, now = 4)
+    assert list(values) == [650, 525, 600]
+    assert buffer.min(2, now = 4) == 525
+    assert buffer.max(2, now = 4) == 650
+    assert buffer.smoothed(2, now = 4) == pytest.approx(np.mean([650, 525, 600]))
+
+
+def test_rates():
+    buffer = filled([500, 575, 650, 525, 600])
+
+    # spending (650 -> 525) shouldn't count against income
+    assert buffer.gain_rate(now = 4) == pytest.approx((75 + 75 + 75) / 4)
+    assert filled([0, 10, 20, 30]).rate(now = 3) == pytest.approx(10)
+
+
+def test_empty():
+    buffer = RingBuffer(4)
+
+    assert buffer.latest() is None
+    assert buffer.rate() == 0
+    assert buffer.min() is None
+
+
+def test_state_history():
+    history = StateHistory(size = 4)
+    history.record("gold", 500, 0)
+    history.record("archers", 2, 0)
+
+    assert history["gold"].latest().value == 500
+    assert history["archers"].size == 4
+
+    history.clear()
+    assert len(history["gold"]) == 0
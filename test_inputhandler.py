@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import types
+
+import numpy as np
+import pytest
+
+try:
+    import pyautogui
+except Exception:
+    # pyautogui needs a display; clicks are patched out below anyway
+    sys.modules["pyautogui"] = types.ModuleType("pyautogui")
+
+import InputHandler as input_module
+from InputHandler import InputHandler
+
+
+class FakeScreen:
+    """Finds the image at (10, 10) and shows a patch that changes after changes_after captures
+    (never if None)."""
+    def __init__(self, changes_after = None):
+        self.changes_after = changes_after
+        self.captures = 0
+
+
+    async def screen_find(self, img_name, threshold = 0.9, *args, **kwargs):
+        return [10, 10, 20, 20]
+
+
+    def get_screen(self, topleft, botright):
+        self.captures += 1
+        changed = self.changes_after is not None and self.captures > self.changes_after
+        return np.full((8, 8, 3), 255 if changed else 0, dtype = np.uint8)
+
+
+@pytest.fixture
+def clicks(monkeypatch):
+    clicks = []
+    monkeypatch.setattr(input_module.pyautogui, "moveTo", lambda *args, **kwargs: None, raising = False)
+    monkeypatch.setattr(input_module.pyautogui, "mouseDown", lambda *args, **kwargs: clicks.append(args), raising = False)
+    monkeypatch.setattr(input_module.pyautogui, "mouseUp", lambda *args, **kwargs: None, raising = False)
+    return clicks
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = InputHandler()
+    monkeypatch.setattr(handler, "ACK_POLL_RATE", 0)
+    return handler
+
+
+def test_region_around():
+    assert InputHandler().region_around((100, 50), size = 10) == ((90, 40), (110, 60))
+    assert InputHandler().region_around((5, 5), size = 10) == ((0, 0), (15, 15))
+
+
+def test_wait_change(handler):
+    screen = FakeScreen(changes_after = 2)
+    before = screen.get_screen((0, 0), (8, 8))
+
+    assert asyncio.run(handler.wait_change(screen, ((0, 0), (8, 8)), before, timeout = 1))
+    assert screen.captures == 3
+
+
+def test_wait_change_timeout(handler):
+    screen = FakeScreen()
+    before = screen.get_screen((0, 0), (8, 8))
+
+    assert not asyncio.run(handler.wait_change(screen, ((0, 0), (8, 8)), before, timeout = 0.05))
+
+
+def test_wait_click_acknowledged(handler, clicks):
+    assert asyncio.run(handler.wait_click(FakeScreen(changes_after = 1), "button", ack = True))
+    assert clicks == [(20, 20)]
+
+
+def test_wait_click_gives_up(handler, clicks):
+    acked = asyncio.run(handler.wait_click(FakeScreen(), "button", ack = True, retry_delay = 0, retries = 1, rounds = 3,
+    ack_timeout = 0.01))
+
+    assert not acked
+    # (retries + 1) clicks per round
+    assert len(clicks) == 6
+
+
+def test_wait_click_no_ack(handler, clicks):
+    assert asyncio.run(handler.wait_click(FakeScreen(), "button"))
+    assert clicks == [(20, 20)]
+
+
+def test_wait_click_timeout(handler, clicks):
+    class MissingScreen(FakeScreen):
+        async def screen_find(self, img_name, threshold = 0.9, *args, **kwargs):
+            return None
+
+    assert not asyncio.run(handler.wait_click(MissingScreen(), "button", retry_delay = 0.01, timeout = 0.05))
+    assert clicks == []
@@ -0,0 +1,76 @@
+import json
+
+from Logger import LFlag, Logger
+
+
+def read_records(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_structured_records(tmp_path):
+    path = tmp_path / "bot.log"
+    logger = Logger(True, LFlag.Resources, log_path = str(path))
+
+    logger.tick = 3
+    logger.log(LFlag.Resources, "update_gold", gold = 575)
+    logger.log(LFlag.Screen, "filtered out", gold = 0)
+    logger.print("hello")
+    logger.close()
+
+    records = read_records(path)
+
+    assert [record["event"] for record in records] == ["update_gold", "print"]
+    assert records[0]["gold"] == 575 and records[0]["tick"] == 3 and records[0]["flag"] == "Resources"
+    assert records[1]["msg"] == "hello"
+    assert logger.written == 2 and logger.dropped == 0
+
+
+def test_disabled_builds_nothing(tmp_path, capsys):
+    logger = Logger(False, log_path = str(tmp_path / "bot.log"))
+
+    logger.log(LFlag.Input, "click")
+    logger.print("hello")
+    logger.close()
+
+    assert not (tmp_path / "bot.log").exists()
+    assert capsys.readouterr().out == ""
+
+
+def test_print_without_log_file(capsys):
+    logger = Logger(True, {LFlag.Input, LFlag.Screen})
+
+    logger.print("shown", {LFlag.Screen, LFlag.Resources})
+    logger.print("hidden", LFlag.Resources)
+
+    assert capsys.readouterr().out == "shown\n"
+
+
+def test_rotation(tmp_path):
+    path = tmp_path / "bot.log"
+    logger = Logger(True, log_path = str(path), max_bytes = 200, backups = 2)
+
+    for i in range(50):
+        logger.log(LFlag.Screen, "step", i = i)
+    logger.close()
+
+    assert (tmp_path / "bot.log.1").exists()
+    assert not (tmp_path / "bot.log.3").exists()
+
+
+def test_close_after_writer_died(tmp_path):
+    logger = Logger(True, log_path = str(tmp_path / "bot.log"), queue_size = 1)
+    # the writer thread stops on None; the full queue then never empties
+    logger._queue.put(None)
+    logger._writer.join()
+    logger.log(LFlag.Screen, "step")
+
+    logger.close()
+
+    assert logger._writer is None
+
+
+def test_report_without_debug(tmp_path, capsys):
+    Logger(False).report("3.2 games per hour")
+
+    assert capsys.readouterr().out == "3.2 games per hour\n"
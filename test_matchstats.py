@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from constants import MatchResult, MenuState
+from MatchStats import MatchStats
+
+
+def test_games_per_hour():
+    stats = MatchStats()
+    stats.start_time = time.time() - 1800
+    for result in (MatchResult.Victory, MatchResult.Defeat, MatchResult.Unknown):
+        stats.start_match()
+        stats.end_match(result)
+
+    assert stats.games_per_hour() == pytest.approx(6, rel = 1e-3)
+    assert "3 games (1W/1L)" in stats.summary()
+
+
+def test_no_games():
+    assert MatchStats().games_per_hour() == 0
+
+
+def test_state_time():
+    stats = MatchStats()
+    stats.add_state_time(MenuState.Main, 2)
+    stats.add_state_time(MenuState.Race, 3)
+    stats.add_state_time(MenuState.PostGame, 4)
+    stats.add_state_time(MenuState.Loading, 10)
+    stats.add_state_time(MenuState.Loading, 5)
+    stats.add_state_time(MenuState.Playing, 100)
+
+    assert stats.menu_time() == 9
+    assert stats.loading_time() == 15
+
+
+def test_match_duration():
+    stats = MatchStats()
+    stats.start_match()
+    stats._match_start -= 90
+
+    assert stats.in_match()
+    record = stats.end_match(MatchResult.Victory)
+
+    assert record.duration == pytest.approx(90, abs = 0.1)
+    assert not stats.in_match()
+
+
+def test_end_match_without_start():
+    stats = MatchStats()
+    record = stats.end_match(MatchResult.Unknown)
+
+    assert record.duration == 0
+    assert stats.records == [record] and not stats.in_match()
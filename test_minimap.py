@@ -0,0 +1,88 @@
+import cv2
+import numpy as np
+import pytest
+
+from constants import ImageName, MINIMAP_COLORS, MINIMAP_STATUES
+from Minimap import MinimapReader
+
+
+@pytest.fixture
+def reader():
+    # the whole frame is the minimap
+    return MinimapReader(offset = (0, 0, 40, 10), bins = 4, anchor = (0, 0))
+
+
+def color(name):
+    low, high = MINIMAP_COLORS[name]
+    return (np.array(low) + np.array(high)) // 2
+
+
+def columns(statue, w = 40):
+    left, right = MINIMAP_STATUES[statue]
+    return slice(int(left * w), max(int(left * w) + 1, int(right * w)))
+
+
+@pytest.fixture
+def frame():
+    return np.zeros((10, 40, 3), dtype = np.uint8)
+
+
+def test_densities(reader, frame):
+    frame[:5, 0:10] = color("friendly")
+    frame[:, 30:40] = color("enemy")
+
+    state = reader.read(frame)
+
+    assert state.friendly == pytest.approx([0.5, 0, 0, 0])
+    assert state.enemy == pytest.approx([0, 0, 0, 1])
+    assert state.center == 0
+
+
+def test_camera(reader, frame):
+    frame[:, 8] = color("camera")
+    frame[:, 19] = color("camera")
+    frame[0, 8:20] = color("camera")
+
+    assert reader.read(frame).camera == pytest.approx((8 / 40, 20 / 40))
+
+
+def test_no_camera(reader, frame):
+    assert reader.read(frame).camera is None
+
+
+def test_center(reader, frame):
+    frame[:, columns("center")] = color("enemy")
+
+    assert reader.read(frame).center == -1
+
+
+def test_statues(reader, frame):
+    frame[:, columns("left")] = color("statue")
+
+    assert reader.read(frame).statues == (True, False)
+
+
+def test_not_located(frame):
+    assert MinimapReader().read(frame) is None
+
+
+def test_screenshot():
+    # a real HUD: the bot's units near the left statue, the camera a sixth of the way in
+    frame = cv2.imread(ImageName["mass_buttons"])
+    res = cv2.matchTemplate(frame, cv2.imread(ImageName["left_mass"]), cv2.TM_CCOEFF_NORMED)
+    reader = MinimapReader(anchor = cv2.minMaxLoc(res)[3])
+
+    state = reader.read(frame)
+
+    assert state.camera == pytest.approx((32 / 198, 62 / 198))
+    assert np.flatnonzero(state.friendly).tolist() == [3, 4, 5]
+    assert not state.enemy.any()
+
+
+def test_read_only(reader, frame):
+    state = reader.read(frame)
+
+    with pytest.raises(ValueError):
+        state.friendly[0] = 1
+    with pytest.raises(ValueError):
+        state.enemy[0] = 1
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from Logger import Logger
+from Perception import Perception
+
+
+class FakeScreen:
+    def __init__(self):
+        self.captures = 0
+
+
+    def get_fullscreen(self):
+        self.captures += 1
+        return np.zeros((10, 10, 3), dtype = np.uint8)
+
+
+def pipeline():
+    return Perception(FakeScreen(), Logger(False))
+
+
+def test_detectors_run_off_loop():
+    perception = pipeline()
+    threads = []
+
+    def detect(frame):
+        threads.append(threading.current_thread())
+        return {"gold": 575}
+
+    applied = []
+    perception.add_detector("gold", detect, 0, apply = applied.append)
+
+    snapshot = asyncio.run(perception.step())
+
+    assert threads[0] is not threading.main_thread()
+    assert applied == [{"gold": 575}]
+    assert snapshot.gold == 575 and snapshot.version == 1
+
+
+def test_failing_detector_doesnt_stop_others():
+    perception = pipeline()
+
+    def fail(frame):
+        raise ValueError("empty crop")
+
+    perception.add_detector("fail", fail, 0)
+    perception.add_detector("mana", lambda frame: {"mana": 50}, 0)
+
+    snapshot = asyncio.run(perception.step())
+
+    assert snapshot.mana == 50
+    assert perception.detectors[0].errors == 1
+
+
+def test_run_survives_failing_detector():
+    perception = pipeline()
+    calls = []
+
+    def fail(frame):
+        calls.append(1)
+        if len(calls) >= 3:
+            perception.stop()
+        raise ValueError("empty crop")
+
+    perception.add_detector("fail", fail, 0)
+    perception.tick_rate = 0
+
+    asyncio.run(perception.run())
+
+    assert perception.detectors[0].errors == 3
+
+
+def test_no_capture_when_nothing_due():
+    perception = pipeline()
+    perception.add_detector("menu", lambda frame: {"menu": ()}, 60)
+
+    asyncio.run(perception.step())
+    asyncio.run(perception.step())
+
+    assert perception.screen.captures == 1
+
+
+def test_inactive_detector():
+    perception = pipeline()
+    perception.add_detector("units", lambda frame: {"units": (("archer", 1, 1),)}, 0, active = lambda: False)
+
+    snapshot = asyncio.run(perception.step())
+
+    assert snapshot.units == () and perception.screen.captures == 0
+
+
+def test_prepare_before_capture():
+    perception = pipeline()
+    events = []
+
+    def prepare():
+        events.append(("prepare", threading.current_thread(), perception.screen.captures))
+
+    perception.add_detector("gold", lambda frame: {"gold": 575}, 0, prepare = prepare)
+
+    asyncio.run(perception.step())
+
+    assert events == [("prepare", threading.main_thread(), 0)]
+    assert perception.screen.captures == 1
@@ -1,9 +1,10 @@
 import asyncio
+import time
 
 import cv2
 import pytest
 
-from constants import ImageName
+from constants import ImageName, Mass
 from EmptyBot import EmptyBot
 from helpers import CounterLE
 
@@ -32,4 +33,102 @@ def test_update_gold_500_swamp(bot1, swamp_500):
     bot1.gold = 500
     asyncio.run(bot1.update_gold(swamp_500))
 
-    assert bot1.gold == 500
\ No newline at end of file
+    assert bot1.gold == 500
+
+
+def predict(bot, income, since):
+    bot._income = income
+    bot._last_gold_increase = time.time() - since
+
+
+def test_read_gold_without_income(bot1, swamp_500):
+    # +150 is a realistic change when nothing is known about income
+    assert bot1.read_gold(swamp_500, 350)[0] == 500
+
+
+def test_read_gold_income_narrows(bot1, swamp_500):
+    # income predicts about +20, so only +75 is considered and 500 (+150) isn't read
+    predict(bot1, 4, 5)
+
+    assert bot1.read_gold(swamp_500, 350)[0] is None
+
+
+def test_read_gold_income_matches(bot1, swamp_500):
+    predict(bot1, 30, 5)
+
+    assert bot1.read_gold(swamp_500, 350)[0] == 500
+
+
+def test_read_gold_income_fallback(bot1, swamp_500):
+    # nothing within GOLD_CHANGE_TOLERANCE of the prediction, so every change is tried
+    predict(bot1, 100, 10)
+
+    assert bot1.read_gold(swamp_500, 350)[0] == 500
+
+def test_spend_during_read(bot1, swamp_500):
+    bot1.gold = 425
+    bot1._prepare_resources()
+    # the frame shows 500 (income arrived), but a unit is bought before the read is applied
+    fields = {"anchors": {"gold": (0, 0, 10, 10)}, "gold": bot1.read_gold(swamp_500, bot1._read_base[0])[0]}
+    bot1.gold -= 150
+    bot1._spent += 150
+
+    bot1._apply_resources(fields)
+
+    assert bot1.gold == 350
+
+
+
+@pytest.fixture
+def clicked(bot1):
+    clicked = []
+
+    async def wait_click(screen, img_name, *args, **kwargs):
+        clicked.append(img_name)
+        return True
+    bot1.input.wait_click = wait_click
+
+    return clicked
+
+
+def test_mass_in_effect_not_repeated(bot1, clicked):
+    asyncio.run(bot1.mass(Mass.Attack))
+    asyncio.run(bot1.mass(Mass.Attack))
+
+    assert clicked == [ImageName["right_mass"]]
+
+
+def test_mass_force(bot1, clicked):
+    asyncio.run(bot1.mass(Mass.Attack))
+    asyncio.run(bot1.mass(Mass.Attack, force = True))
+
+    assert clicked == [ImageName["right_mass"]] * 2
+
+
+def test_mass_side_change(bot1, clicked):
+    asyncio.run(bot1.mass(Mass.Attack))
+    bot1.on_left = False
+    asyncio.run(bot1.mass(Mass.Attack))
+
+    assert clicked == [ImageName["right_mass"], ImageName["left_mass"]]
+
+
+def test_mass_groups(bot1, clicked):
+    asyncio.run(bot1.mass(Mass.Attack))
+    asyncio.run(bot1.mass(Mass.MinerAdvance))
+    # the miner order doesn't replace the army order, and the other way around
+    asyncio.run(bot1.mass(Mass.Attack))
+    asyncio.run(bot1.mass(Mass.MinerAdvance))
+    asyncio.run(bot1.mass(Mass.Garrison))
+
+    assert clicked == [ImageName["right_mass"], ImageName["right_mass_miner"], ImageName["left_mass"]]
+
+
+def test_mass_not_found(bot1):
+    async def wait_click(*args, **kwargs):
+        return False
+    bot1.input.wait_click = wait_click
+
+    asyncio.run(bot1.mass(Mass.Attack))
+
+    assert bot1.mass_in_effect == {}
@@ -0,0 +1,120 @@
+import cv2
+import numpy as np
+import pytest
+
+from ScreenHandler import ScreenHandler
+from TileCache import TileCache
+
+
+@pytest.fixture
+def screen():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (100, 130), dtype = np.uint8)
+
+
+@pytest.fixture
+def template(screen):
+    return screen[40:52, 60:75].copy()
+
+
+def full_match(screen, template):
+    return cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+
+
+def test_clean_screen_reuses_result(screen, template):
+    cache = TileCache(16)
+    first = cache.match("t", screen, template)
+    second = cache.match("t", screen.copy(), template)
+
+    assert second is first
+
+
+def test_dirty_tile(screen, template):
+    cache = TileCache(16)
+    cache.match("t", screen, template)
+
+    changed = screen.copy()
+    changed[70:75, 20:30] = 255
+
+    assert np.allclose(cache.match("t", changed, template), full_match(changed, template), atol = 1e-4)
+
+
+def test_match_straddling_tile_edges(screen, template):
+    # the match at (10, 5) starts in a clean tile, but its window reaches into a tile that changes
+    before = screen.copy()
+    before[10:22, 5:20] = template
+    before[20, 18] = before[20, 18] ^ 0xFF
+
+    cache = TileCache(16)
+    cache.match("t", before, template)
+
+    after = before.copy()
+    after[20, 18] = template[10, 13]
+
+    res = cache.match("t", after, template)
+
+    assert np.allclose(res, full_match(after, template), atol = 1e-4)
+    assert res[10, 5] == pytest.approx(1.0)
+
+
+def test_mostly_dirty_matches_once(screen, template, monkeypatch):
+    cache = TileCache(16)
+    cache.match("t", screen, template)
+
+    # an animated battlefield: every tile but the bottom row changes
+    changed = screen.copy()
+    changed[:90] = 255 - changed[:90]
+    expected = full_match(changed, template)
+
+    calls = []
+    match_template = cv2.matchTemplate
+    monkeypatch.setattr(cv2, "matchTemplate", lambda *args: calls.append(args[0].shape) or match_template(*args))
+
+    assert np.allclose(cache.match("t", changed, template), expected, atol = 1e-4)
+    assert calls == [screen.shape]
+
+
+def test_dirty_rects(screen):
+    cache = TileCache(16)
+    dirty = np.zeros((7, 9), dtype = bool)
+    dirty[1:4, 2:5] = True
+    dirty[6, 8] = True
+
+    assert sorted(cache._dirty_rects(dirty)) == [(1, 2, 4, 5), (6, 8, 7, 9)]
+
+
+def test_dirty_tiles_grid(screen):
+    cache = TileCache(32)
+    changed = screen.copy()
+    changed[99, 129] = changed[99, 129] ^ 1
+
+    dirty = cache.dirty_tiles(cache.signature(screen), cache.signature(changed))
+
+    assert dirty.shape == (4, 5)
+    assert dirty.sum() == 1 and dirty[3, 4]
+
+
+def test_signature_reused(screen, template):
+    cache = TileCache(16)
+    signature = cache.signature(screen)
+    first = cache.match("a", screen, template, signature)
+
+    assert cache.match("a", screen, template, signature) is first
+    assert np.allclose(cache.match("b", screen, template, signature), first)
+
+
+def test_processed_once_per_screen():
+    handler = ScreenHandler((0, 0), (10, 10))
+    frame = np.zeros((40, 40, 3), dtype = np.uint8)
+
+    gray, signature = handler.process(frame)
+    assert handler.process(frame)[0] is gray
+    assert handler.process(frame, blackwhite = 200)[0] is not gray
+    assert handler.process(frame.copy())[0] is not gray
+
+
+def test_missing_template():
+    handler = ScreenHandler((0, 0), (10, 10))
+
+    with pytest.raises(FileNotFoundError):
+        handler.find("images/missing.PNG", screen = np.zeros((40, 40, 3), dtype = np.uint8))
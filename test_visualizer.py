@@ -0,0 +1,34 @@
+import time
+from types import MappingProxyType
+
+import numpy as np
+
+from Perception import GameSnapshot
+from Visualizer import Visualizer
+
+
+def colored(img, color):
+    return np.all(img == color, axis = 2)
+
+
+def test_draw():
+    visualizer = Visualizer()
+    frame = np.zeros((200, 300, 3), dtype = np.uint8)
+    snapshot = GameSnapshot(version = 1, timestamp = time.time(), anchors = MappingProxyType({"gold": (100, 60, 30, 20)}),
+    digits = (("5", 150, 100, 10, 14),), units = (("archer", 250, 150),))
+
+    img = visualizer.draw(frame, snapshot, [(time.time(), "Action(build, None)")])
+
+    # the frame itself is left alone
+    assert not frame.any()
+
+    anchor = colored(img, Visualizer.ANCHOR_COLOR)
+    assert anchor[60, 100:131].all() and anchor[80, 100:131].all()
+
+    digit = colored(img, Visualizer.DIGIT_COLOR)
+    assert digit[100, 150:161].all() and digit[100:115, 150].all() and digit[100:115, 160].all()
+    assert not digit[105, 155]
+
+    assert colored(img, Visualizer.UNIT_COLOR)[150, 244:247].any()
+    # status and action lines
+    assert colored(img[:40], Visualizer.TEXT_COLOR).any()